@@ -1,19 +1,23 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import time
 import json
+import hashlib
+import html
 
 from data_fetcher import fetch_cryptocurrency_data, get_available_cryptocurrencies, fetch_current_prices
-from crypto_analysis import identify_promising_cryptocurrencies, generate_signals
+from crypto_analysis import identify_promising_cryptocurrencies, generate_signals, format_signal_details
 from technical_indicators import calculate_technical_indicators
-from utils import format_currency, get_price_change_color, format_date
+from utils import format_currency_array, get_price_change_color
 import database
+from sqlalchemy import delete, func, select
 from database import (
-    save_price_history,
-    save_technical_indicators,
+    save_market_data_bulk,
     save_signal,
     save_user_preference,
     get_user_preference,
@@ -24,185 +28,426 @@ from exchange_connector import (
     get_available_exchanges, initialize_exchange, save_exchange_credentials,
     get_exchange_credentials, get_account_balance, place_market_order, place_limit_order,
     get_order_status, cancel_order, get_open_orders, get_order_history, get_ticker,
-    get_available_pairs, save_order_to_db, update_order_status_in_db, get_orders_from_db
+    get_available_pairs, update_order_status_in_db, get_orders_from_db
 )
 from ai_advisor import analyze_crypto_data, generate_investment_strategy, get_market_sentiment, ask_ai_advisor
 from ia_agent import IAAgent
 
-# Initialiser l'agent IA
-ia_agent = IAAgent()
+# Colonnes OHLCV stockées en simple précision (suffisante pour l'affichage et les indicateurs)
+_OHLCV_DTYPES = {'open': 'float32', 'high': 'float32', 'low': 'float32', 'close': 'float32', 'volume': 'float32'}
 
-# Configuration de la page
-st.set_page_config(
-    page_title="Analyse de Cryptomonnaies",
-    page_icon="📈",
-    layout="wide",
-)
+def _downcast(df):
+    """
+    Convertit les colonnes OHLCV en float32 pour réduire la mémoire et la taille des graphiques
+    
+    Args:
+        df (pandas.DataFrame): DataFrame OHLCV
+        
+    Returns:
+        pandas.DataFrame: DataFrame avec les colonnes OHLCV en float32
+    """
+    return df.astype({col: dtype for col, dtype in _OHLCV_DTYPES.items() if col in df.columns})
 
-# Titre et description
-st.title("📊 Plateforme d'Analyse de Cryptomonnaies de Alexis Adinguera")
-st.markdown("""
-Cette application analyse les tendances des cryptomonnaies et identifie des opportunités
-d'investissement en générant des signaux d'achat et de vente basés sur des indicateurs techniques.
-""")
+# Fonctions mises en cache pour éviter de rappeler les API à chaque réexécution du script
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_fetch(symbol, period):
+    """
+    Récupère les données historiques d'une cryptomonnaie (mises en cache 60 secondes)
+    
+    Args:
+        symbol (str): Symbole de la cryptomonnaie
+        period (str): Période de temps ('1d', '7d', '30d', '90d')
+        
+    Returns:
+        pandas.DataFrame: DataFrame contenant les données OHLCV
+    """
+    return _downcast(fetch_cryptocurrency_data(symbol, period))
 
-# Sidebar pour les options
-st.sidebar.header("Options d'Analyse")
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_available_cryptocurrencies():
+    """
+    Récupère la liste des cryptomonnaies disponibles (mise en cache 1 heure)
+    """
+    return get_available_cryptocurrencies()
 
-# Sélection de la période
-time_periods = {
-    "24 heures": "1d",
-    "7 jours": "7d",
-    "30 jours": "30d",
-    "90 jours": "90d"
-}
-selected_period = st.sidebar.selectbox(
-    "Période d'analyse",
-    list(time_periods.keys()),
-    index=1  # Default to 7 days
-)
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_available_exchanges():
+    """
+    Récupère la liste des échanges disponibles (mise en cache 1 heure)
+    """
+    return get_available_exchanges()
 
-# Chargement des cryptomonnaies disponibles
-try:
-    available_cryptos = get_available_cryptocurrencies()
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_indicators(symbol, last_timestamp, length, last_close, _df):
+    """
+    Calcule les indicateurs techniques d'une cryptomonnaie (mis en cache par symbole et dernière bougie)
     
-    # Sélection des cryptomonnaies à analyser
-    default_cryptos = ["BTC", "ETH", "BNB", "XRP", "SOL"]
-    selected_cryptos = st.sidebar.multiselect(
-        "Sélectionner les cryptomonnaies à analyser",
-        available_cryptos,
-        default=default_cryptos
-    )
+    Args:
+        symbol (str): Symbole de la cryptomonnaie
+        last_timestamp: Horodatage de la dernière bougie (clé de cache)
+        length (int): Nombre de bougies (clé de cache)
+        last_close (float): Dernier prix de clôture (clé de cache, la bougie en cours évolue)
+        _df (pandas.DataFrame): DataFrame OHLCV (non haché par Streamlit)
+        
+    Returns:
+        pandas.DataFrame: DataFrame avec les indicateurs techniques (en float32)
+    """
+    df = calculate_technical_indicators(_df)
     
-    # Si aucune crypto n'est sélectionnée, utilisez les valeurs par défaut
-    if not selected_cryptos:
-        selected_cryptos = default_cryptos
-        st.sidebar.warning("Aucune crypto sélectionnée, utilisation des valeurs par défaut.")
-
-    # Sélection des indicateurs techniques
-    technical_indicators = st.sidebar.multiselect(
-        "Indicateurs techniques",
-        ["RSI", "MACD", "Bollinger Bands", "EMA", "SMA"],
-        default=["RSI", "MACD"]
-    )
+    # Indicateurs en float32: deux fois moins de mémoire dans le cache, précision suffisante pour les seuils
+    return df.astype({col: 'float32' for col in df.select_dtypes('float64').columns})
 
-    # Bouton pour actualiser les données
-    if st.sidebar.button("Actualiser les données"):
-        st.rerun()
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_promising(data_key, selected_indicators, _crypto_data, _indicators_cache):
+    """
+    Identifie les cryptomonnaies prometteuses (mis en cache par état des données et indicateurs sélectionnés)
+    
+    Args:
+        data_key (tuple): (symbole, dernière bougie, nombre de bougies, dernière clôture) par cryptomonnaie (clé de cache)
+        selected_indicators (tuple): Indicateurs techniques sélectionnés
+        _crypto_data (dict): Données OHLCV par symbole (non hachées par Streamlit)
+        _indicators_cache (dict): Indicateurs déjà calculés par symbole (non hachés par Streamlit)
+        
+    Returns:
+        list: Liste des tuples (crypto, score) triés par score décroissant
+    """
+    return identify_promising_cryptocurrencies(_crypto_data, list(selected_indicators), indicators_cache=_indicators_cache)
 
-    # Affichage du dernier rafraîchissement
-    st.sidebar.text(f"Dernière mise à jour: {datetime.now().strftime('%H:%M:%S')}")
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_signals(data_key, selected_indicators, _crypto_data, _indicators_cache):
+    """
+    Génère les signaux d'achat/vente (mis en cache par état des données et indicateurs sélectionnés)
+    
+    Args:
+        data_key (tuple): (symbole, dernière bougie, nombre de bougies, dernière clôture) par cryptomonnaie (clé de cache)
+        selected_indicators (tuple): Indicateurs techniques sélectionnés
+        _crypto_data (dict): Données OHLCV par symbole (non hachées par Streamlit)
+        _indicators_cache (dict): Indicateurs déjà calculés par symbole (non hachés par Streamlit)
+        
+    Returns:
+        dict: Dictionnaire des signaux par cryptomonnaie
+    """
+    return generate_signals(_crypto_data, list(selected_indicators), indicators_cache=_indicators_cache)
 
-    # Chargement et analyse des données
-    with st.spinner("Chargement des données des cryptomonnaies..."):
-        # Obtenir la période en jours
-        period = time_periods[selected_period]
+def _data_hash(df):
+    """
+    Calcule une empreinte des données de prix pour détecter les données inchangées
+    
+    Args:
+        df (pandas.DataFrame): DataFrame OHLCV
         
-        # Variable pour détecter si on utilise des données de démonstration
-        using_demo_data = False
+    Returns:
+        bytes: Empreinte BLAKE2b de l'index et des prix de clôture
+    """
+    digest = hashlib.blake2b(df.index.to_numpy().tobytes())
+    digest.update(df['close'].to_numpy().tobytes())
+    return digest.digest()
+
+# Nombre maximal de points transmis aux graphiques avant rééchantillonnage
+_DISPLAY_MAX_POINTS = 1500
+_OHLCV_AGG = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+def _for_display(df):
+    """
+    Réduit une série trop longue pour l'affichage en la regroupant en bougies de 4 heures
+    
+    Args:
+        df (pandas.DataFrame): DataFrame OHLCV (avec ou sans indicateurs)
         
-        # Récupérer les données pour chaque crypto sélectionnée
-        all_crypto_data = {}
-        for crypto in selected_cryptos:
-            crypto_data = fetch_cryptocurrency_data(crypto, period)
-            # Vérifier si le DataFrame est vide
-            if not crypto_data.empty:
-                all_crypto_data[crypto] = crypto_data
-                
-                # Vérifier si nous utilisons des données de démonstration (prix arrondis typiques des données générées)
-                if abs(crypto_data['close'].iloc[-1] - round(crypto_data['close'].iloc[-1], 0)) < 0.0001:
-                    using_demo_data = True
+    Returns:
+        pandas.DataFrame: DataFrame d'origine ou rééchantillonné si plus de 1500 points
+    """
+    if len(df) <= _DISPLAY_MAX_POINTS:
+        return df
+    
+    # Agrégation OHLCV classique, dernière valeur pour les indicateurs
+    agg = {col: _OHLCV_AGG.get(col, 'last') for col in df.columns}
+    return df.resample('4h').agg(agg).dropna(how='all')
+
+def _get_indicators(indicators_cache, symbol, df):
+    """
+    Retourne les indicateurs techniques d'une cryptomonnaie, calculés une seule fois par exécution
+    
+    Args:
+        indicators_cache (dict): Indicateurs déjà calculés {symbole: DataFrame}
+        symbol (str): Symbole de la cryptomonnaie
+        df (pandas.DataFrame): DataFrame OHLCV
         
-        # Identifier les cryptomonnaies prometteuses
-        promising_cryptos = identify_promising_cryptocurrencies(all_crypto_data, technical_indicators)
+    Returns:
+        pandas.DataFrame: DataFrame avec les indicateurs techniques
+    """
+    if symbol not in indicators_cache:
+        indicators_cache[symbol] = _cached_indicators(symbol, df.index[-1], len(df), float(df['close'].iat[-1]), df)
+    return indicators_cache[symbol]
+
+def _credentials_hash(api_key, api_secret):
+    """
+    Calcule une empreinte des identifiants d'API (utilisée comme clé de cache à la place des secrets)
+    """
+    return hashlib.blake2b(f"{api_key}:{api_secret}".encode("utf-8"), digest_size=16).hexdigest()
+
+@st.cache_resource(show_spinner=False)
+def _cached_exchange(exchange_name, credentials_hash, test_mode, _api_key, _api_secret):
+    """
+    Initialise la connexion à un échange une seule fois par jeu d'identifiants
+    
+    Args:
+        exchange_name (str): ID de l'échange
+        credentials_hash (str): Empreinte des identifiants (clé de cache)
+        test_mode (bool): Si vrai, utilise le mode test (sandbox)
+        _api_key (str): Clé API (non hachée par Streamlit)
+        _api_secret (str): Secret API (non haché par Streamlit)
         
-        # Générer les signaux
-        signals = generate_signals(all_crypto_data, technical_indicators)
+    Returns:
+        ccxt.Exchange: Instance de l'échange
+    """
+    exchange = initialize_exchange(exchange_name, _api_key, _api_secret, test_mode=test_mode)
+    
+    # Lever une exception pour que l'échec ne soit pas mis en cache
+    if exchange is None:
+        raise ConnectionError(f"Impossible de se connecter à {exchange_name}")
+    
+    return exchange
+
+def _get_exchange(exchange_name, api_key, api_secret, test_mode=True):
+    """
+    Retourne la connexion mise en cache à un échange
+    
+    Args:
+        exchange_name (str): ID de l'échange
+        api_key (str): Clé API
+        api_secret (str): Secret API
+        test_mode (bool): Si vrai, utilise le mode test (sandbox)
         
-        # Avertissement pour les données de démonstration
-        if using_demo_data:
-            st.warning("""
-            **Mode démonstration activé** : L'API CoinGecko a atteint sa limite de requêtes. 
-            Nous utilisons des données de démonstration générées localement. 
-            Ces données ne reflètent pas les prix réels du marché mais vous permettent de continuer 
-            à explorer l'application. Veuillez réessayer plus tard pour obtenir des données en temps réel.
-            """)
-            
-            # Ajouter une indication du temps estimé avant que l'API soit à nouveau disponible
-            current_time = datetime.now()
-            # CoinGecko limite à 10-30 requêtes par minute pour les API gratuites
-            next_available = current_time + timedelta(minutes=1)
-            st.info(f"L'API devrait être à nouveau disponible vers {next_available.strftime('%H:%M')}.")
+    Returns:
+        ccxt.Exchange or None: Instance de l'échange ou None en cas d'erreur
+    """
+    try:
+        return _cached_exchange(exchange_name, _credentials_hash(api_key, api_secret), test_mode, api_key, api_secret)
+    except ConnectionError:
+        return None
 
-    # Tableau de bord principal
-    col1, col2 = st.columns([2, 1])
+@st.cache_data(ttl=15, show_spinner=False)
+def _cached_balances(exchange_name, credentials_hash, _exchange):
+    """
+    Récupère les soldes du compte (mis en cache 15 secondes)
+    
+    Args:
+        exchange_name (str): ID de l'échange (clé de cache)
+        credentials_hash (str): Empreinte des identifiants (clé de cache)
+        _exchange (ccxt.Exchange): Instance de l'échange (non hachée par Streamlit)
+        
+    Returns:
+        dict: Soldes du compte
+    """
+    return get_account_balance(_exchange)
 
-    with col1:
-        st.header("Aperçu du Marché")
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_pairs(exchange_name, credentials_hash, _exchange):
+    """
+    Récupère les paires de trading disponibles (mises en cache 60 secondes)
+    
+    Args:
+        exchange_name (str): ID de l'échange (clé de cache)
+        credentials_hash (str): Empreinte des identifiants (clé de cache)
+        _exchange (ccxt.Exchange): Instance de l'échange (non hachée par Streamlit)
         
-        # Créer un dataframe pour le tableau de marché
-        market_data = []
-        for crypto, data in all_crypto_data.items():
-            if not data.empty:
-                current_price = data['close'].iloc[-1]
-                price_24h_ago = data['close'].iloc[-24] if len(data) > 24 else data['close'].iloc[0]
-                change_24h = ((current_price - price_24h_ago) / price_24h_ago) * 100
-                
-                market_data.append({
-                    "Crypto": crypto,
-                    "Prix Actuel": format_currency(current_price),
-                    "Changement (24h)": f"{change_24h:.2f}%",
-                    "Volume (24h)": format_currency(data['volume'].iloc[-1]),
-                    "Signal": signals[crypto]['signal'] if crypto in signals else "Neutre"
-                })
+    Returns:
+        list: Liste des paires disponibles
+    """
+    return get_available_pairs(_exchange)
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _cached_ticker(exchange_name, credentials_hash, symbol, _exchange):
+    """
+    Récupère le ticker d'une paire (mis en cache 5 secondes)
+    
+    Args:
+        exchange_name (str): ID de l'échange (clé de cache)
+        credentials_hash (str): Empreinte des identifiants (clé de cache)
+        symbol (str): Paire de trading
+        _exchange (ccxt.Exchange): Instance de l'échange (non hachée par Streamlit)
         
-        market_df = pd.DataFrame(market_data)
+    Returns:
+        dict: Informations du ticker
+    """
+    return get_ticker(_exchange, symbol)
+
+# Intervalle minimal (en secondes) entre deux récupérations des ordres ouverts
+_OPEN_ORDERS_REFRESH_INTERVAL = 15
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _cached_orders_from_db(exchange_id, symbol, limit):
+    """
+    Récupère l'historique des ordres depuis la base de données (mis en cache 10 secondes)
+    
+    Args:
+        exchange_id (str): ID de l'échange
+        symbol (str): Paire de trading
+        limit (int): Nombre maximum d'ordres
         
-        # Appliquer une couleur conditionnelle
-        def color_change(val):
-            if "%" in str(val):
-                try:
-                    value = float(val.replace("%", ""))
-                    if value > 0:
-                        return 'background-color: rgba(0, 255, 0, 0.2)'
-                    elif value < 0:
-                        return 'background-color: rgba(255, 0, 0, 0.2)'
-                except:
-                    pass
-            return ''
+    Returns:
+        list: Liste des ordres
+    """
+    return get_orders_from_db(exchange_id=exchange_id, symbol=symbol, limit=limit)
+
+_ORDER_COLUMNS = {
+    "id": "ID",
+    "symbol": "Paire",
+    "type": "Type",
+    "side": "Côté",
+    "amount": "Quantité",
+    "price": "Prix",
+    "status": "Statut",
+    "timestamp": "Date",
+}
+
+def _orders_table(orders_df):
+    """
+    Met en forme un tableau d'ordres pour l'affichage, colonne par colonne
+    
+    Args:
+        orders_df (pd.DataFrame): Ordres avec les colonnes id, symbol, type, side, amount, price, status et timestamp
         
-        def color_signal(val):
-            if val == "Achat":
-                return 'background-color: rgba(0, 255, 0, 0.3); color: darkgreen; font-weight: bold'
-            elif val == "Vente":
-                return 'background-color: rgba(255, 0, 0, 0.3); color: darkred; font-weight: bold'
-            return ''
+    Returns:
+        pd.DataFrame: Tableau des ordres avec les colonnes renommées et formatées
+    """
+    table = orders_df.reindex(columns=list(_ORDER_COLUMNS))
+    
+    # Les timestamps de l'échange sont en millisecondes, ceux de la base de données sont des dates
+    timestamps = table["timestamp"]
+    if pd.api.types.is_numeric_dtype(timestamps):
+        dates = pd.to_datetime(timestamps.where(timestamps > 0), unit="ms", errors="coerce")
+    else:
+        dates = pd.to_datetime(timestamps, errors="coerce")
+    table["timestamp"] = dates.dt.strftime("%d/%m/%Y %H:%M").fillna("N/A")
+    
+    # Un prix absent ou nul correspond à un ordre au marché
+    price = pd.to_numeric(table["price"], errors="coerce")
+    table["price"] = price.astype(object).where(price.notna() & (price != 0), "Market")
+    table["amount"] = table["amount"].fillna(0)
+    
+    text_columns = ["id", "symbol", "type", "side", "status"]
+    table[text_columns] = table[text_columns].fillna("N/A")
+    
+    return table.rename(columns=_ORDER_COLUMNS)
+
+@st.cache_data(show_spinner=False)
+def _parse_indicators(signal_id, raw):
+    """
+    Décode les indicateurs JSON d'un signal (mis en cache par signal)
+    
+    Args:
+        signal_id (int): ID du signal (clé de cache)
+        raw (str): Indicateurs sérialisés en JSON
         
-        # Afficher le tableau avec mise en forme
-        st.dataframe(
-            market_df.style
-            .map(color_change, subset=['Changement (24h)'])
-            .map(color_signal, subset=['Signal'])
+    Returns:
+        dict: Indicateurs techniques du signal
+    """
+    return json.loads(raw)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _db_stats():
+    """
+    Calcule les statistiques de la base de données (mises en cache 60 secondes)
+    
+    Returns:
+        dict: Nombre de signaux par type et nombre d'entrées des tables de prix et d'indicateurs
+    """
+    session = database.Session()
+    
+    try:
+        # Compter les signaux par type en une seule requête groupée
+        signal_counts = dict(
+            session.query(database.Signal.signal_type, func.count())
+            .group_by(database.Signal.signal_type)
+            .all()
         )
+        
+        # Compter les entrées dans les autres tables (deux sous-requêtes scalaires, un seul aller-retour)
+        price_count, indicator_count = session.query(
+            select(func.count()).select_from(database.PriceHistory).scalar_subquery(),
+            select(func.count()).select_from(database.TechnicalIndicator).scalar_subquery()
+        ).one()
+        
+        return {
+            "achat": signal_counts.get("achat", 0),
+            "vente": signal_counts.get("vente", 0),
+            "neutre": signal_counts.get("neutre", 0),
+            "price_history": price_count,
+            "technical_indicators": indicator_count
+        }
+    
+    finally:
+        session.close()
 
-    with col2:
-        st.header("Cryptomonnaies Prometteuses")
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_ai_analysis(payload_json):
+    """
+    Analyse une cryptomonnaie avec le conseiller IA (mise en cache 10 minutes par contenu des données)
+    
+    Args:
+        payload_json (str): Liste JSON [crypto_data, technical_data] sérialisée avec des clés triées
         
-        if promising_cryptos:
-            for idx, (crypto, score) in enumerate(promising_cryptos):
-                st.markdown(f"**{idx+1}. {crypto}** - Score: {score:.2f}")
-                if crypto in signals:
-                    signal_color = "green" if signals[crypto]['signal'] == "Achat" else "red" if signals[crypto]['signal'] == "Vente" else "gray"
-                    st.markdown(f"<span style='color:{signal_color};font-weight:bold;'>{signals[crypto]['signal']}</span> - {signals[crypto]['reason']}", unsafe_allow_html=True)
-        else:
-            st.info("Aucune cryptomonnaie particulièrement prometteuse n'a été identifiée pour le moment.")
+    Returns:
+        CryptoAnalysis: Analyse et conseils d'investissement
+    """
+    crypto_data, technical_data = json.loads(payload_json)
+    return analyze_crypto_data(crypto_data, technical_data)
 
-    # Création des onglets principaux pour l'application
-    main_tabs = st.tabs(["Analyse Graphique", "Trading", "Historique des Signaux", "Base de Données", "Conseiller IA", "Agent IA"])
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_market_sentiment():
+    """
+    Analyse le sentiment général du marché (mise en cache 10 minutes)
     
-    with main_tabs[0]:
-        st.header("Analyse Graphique")
+    Returns:
+        SentimentResult: Analyse du sentiment du marché
+    """
+    return get_market_sentiment()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_investment_strategy(portfolio, risk_profile):
+    """
+    Génère une stratégie d'investissement (mise en cache 1 heure par portefeuille et profil de risque)
+    
+    Args:
+        portfolio (dict): Quantités détenues par cryptomonnaie
+        risk_profile (str): Profil de risque ("conservative", "moderate", "aggressive")
+        
+    Returns:
+        StrategyResult: Stratégie d'investissement personnalisée
+    """
+    return generate_investment_strategy(portfolio, risk_profile)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_ai_answer(question, context):
+    """
+    Répond à une question du conseiller IA (mise en cache 1 heure par question et contexte)
+    
+    Args:
+        question (str): Question posée
+        context (dict): Contexte supplémentaire (optionnel)
+        
+    Returns:
+        str: Réponse du conseiller IA
+    """
+    return ask_ai_advisor(question, context)
+
+@st.fragment
+def render_chart_tab(all_crypto_data, selected_cryptos, signals, technical_indicators, indicators_cache):
+    """
+    Affiche l'onglet d'analyse graphique d'une cryptomonnaie
+    
+    Exécuté comme fragment Streamlit: changer de crypto ne relance que ce bloc,
+    sans recharger les données ni refaire les sauvegardes en base.
     
+    Args:
+        all_crypto_data (dict): Données OHLCV par symbole
+        selected_cryptos (list): Cryptomonnaies sélectionnées
+        signals (dict): Signaux générés par symbole
+        technical_indicators (list): Indicateurs techniques sélectionnés
+        indicators_cache (dict): Indicateurs déjà calculés {symbole: DataFrame}
+    """
     selected_crypto_for_chart = st.selectbox(
         "Sélectionner une cryptomonnaie pour l'analyse graphique",
         selected_cryptos,
@@ -214,7 +459,11 @@ try:
         
         if not df.empty:
             # Calculer les indicateurs techniques pour cette crypto
-            df_with_indicators = calculate_technical_indicators(df)
+            df_with_indicators = _get_indicators(indicators_cache, selected_crypto_for_chart, df)
+            
+            # Réduire les séries longues avant de les transmettre à Plotly
+            chart_df = _for_display(df)
+            chart_indicators = _for_display(df_with_indicators)
             
             # Créer un onglet pour chaque type de graphique
             chart_tabs = st.tabs(["Prix", "Volume", "Indicateurs Techniques"])
@@ -224,44 +473,44 @@ try:
                 fig = go.Figure()
                 
                 fig.add_trace(go.Candlestick(
-                    x=df.index,
-                    open=df['open'],
-                    high=df['high'],
-                    low=df['low'],
-                    close=df['close'],
+                    x=chart_df.index,
+                    open=chart_df['open'],
+                    high=chart_df['high'],
+                    low=chart_df['low'],
+                    close=chart_df['close'],
                     name="Prix"
                 ))
                 
-                # Ajouter les moyennes mobiles si disponibles
-                if 'EMA_20' in df_with_indicators.columns:
-                    fig.add_trace(go.Scatter(
-                        x=df_with_indicators.index,
-                        y=df_with_indicators['EMA_20'],
+                # Ajouter les moyennes mobiles si disponibles (traces WebGL, le chandelier reste en SVG)
+                if 'EMA_20' in chart_indicators.columns:
+                    fig.add_trace(go.Scattergl(
+                        x=chart_indicators.index,
+                        y=chart_indicators['EMA_20'],
                         mode='lines',
                         name='EMA 20'
                     ))
                 
-                if 'SMA_50' in df_with_indicators.columns:
-                    fig.add_trace(go.Scatter(
-                        x=df_with_indicators.index,
-                        y=df_with_indicators['SMA_50'],
+                if 'SMA_50' in chart_indicators.columns:
+                    fig.add_trace(go.Scattergl(
+                        x=chart_indicators.index,
+                        y=chart_indicators['SMA_50'],
                         mode='lines',
                         name='SMA 50'
                     ))
                 
                 # Ajouter les bandes de Bollinger si disponibles
-                if 'BB_upper' in df_with_indicators.columns:
-                    fig.add_trace(go.Scatter(
-                        x=df_with_indicators.index,
-                        y=df_with_indicators['BB_upper'],
+                if 'BB_upper' in chart_indicators.columns:
+                    fig.add_trace(go.Scattergl(
+                        x=chart_indicators.index,
+                        y=chart_indicators['BB_upper'],
                         mode='lines',
                         line=dict(width=0.5, color='rgba(100, 100, 100, 0.3)'),
                         name='BB Upper'
                     ))
                     
-                    fig.add_trace(go.Scatter(
-                        x=df_with_indicators.index,
-                        y=df_with_indicators['BB_lower'],
+                    fig.add_trace(go.Scattergl(
+                        x=chart_indicators.index,
+                        y=chart_indicators['BB_lower'],
                         mode='lines',
                         line=dict(width=0.5, color='rgba(100, 100, 100, 0.3)'),
                         fill='tonexty',
@@ -269,26 +518,28 @@ try:
                         name='BB Lower'
                     ))
                 
-                # Ajouter des marqueurs pour les signaux si disponibles
-                if selected_crypto_for_chart in signals:
-                    if signals[selected_crypto_for_chart]['signal'] == "Achat":
-                        buy_points = df_with_indicators[df_with_indicators['signal'] == 1]
-                        fig.add_trace(go.Scatter(
-                            x=buy_points.index,
-                            y=buy_points['close'],
-                            mode='markers',
-                            marker=dict(size=10, color='green', symbol='triangle-up'),
-                            name='Signal d\'achat'
-                        ))
-                    elif signals[selected_crypto_for_chart]['signal'] == "Vente":
-                        sell_points = df_with_indicators[df_with_indicators['signal'] == -1]
-                        fig.add_trace(go.Scatter(
-                            x=sell_points.index,
-                            y=sell_points['close'],
-                            mode='markers',
-                            marker=dict(size=10, color='red', symbol='triangle-down'),
-                            name='Signal de vente'
-                        ))
+                # Ajouter des marqueurs pour les signaux (masques calculés une seule fois, traces vides si aucun point)
+                if 'signal' in chart_indicators.columns:
+                    signal_values = df_with_indicators['signal'].to_numpy()
+                    close_values = df_with_indicators['close'].to_numpy()
+                    buy_mask = signal_values == 1
+                    sell_mask = signal_values == -1
+                    
+                    fig.add_trace(go.Scattergl(
+                        x=df_with_indicators.index[buy_mask],
+                        y=close_values[buy_mask],
+                        mode='markers',
+                        marker=dict(size=10, color='green', symbol='triangle-up'),
+                        name='Signal d\'achat'
+                    ))
+                    
+                    fig.add_trace(go.Scattergl(
+                        x=df_with_indicators.index[sell_mask],
+                        y=close_values[sell_mask],
+                        mode='markers',
+                        marker=dict(size=10, color='red', symbol='triangle-down'),
+                        name='Signal de vente'
+                    ))
                 
                 fig.update_layout(
                     title=f"{selected_crypto_for_chart} - Évolution du Prix",
@@ -305,8 +556,8 @@ try:
                 fig = go.Figure()
                 
                 fig.add_trace(go.Bar(
-                    x=df.index,
-                    y=df['volume'],
+                    x=chart_df.index,
+                    y=chart_df['volume'],
                     name="Volume"
                 ))
                 
@@ -325,31 +576,33 @@ try:
                 
                 for i, indicator in enumerate([ind for ind in technical_indicators if ind in ["RSI", "MACD", "Bollinger Bands"]]):
                     with indicator_tabs[i]:
-                        if indicator == "RSI" and "RSI" in df_with_indicators.columns:
+                        if indicator == "RSI" and "RSI" in chart_indicators.columns:
                             fig = go.Figure()
                             
                             fig.add_trace(go.Scatter(
-                                x=df_with_indicators.index,
-                                y=df_with_indicators['RSI'],
+                                x=chart_indicators.index,
+                                y=chart_indicators['RSI'],
                                 mode='lines',
                                 name='RSI'
                             ))
                             
                             # Ajouter des lignes horizontales pour les niveaux de survente et surachat
+                            x0, x1 = chart_indicators.index[0], chart_indicators.index[-1]
+                            
                             fig.add_shape(
                                 type="line",
-                                x0=df_with_indicators.index[0],
+                                x0=x0,
                                 y0=70,
-                                x1=df_with_indicators.index[-1],
+                                x1=x1,
                                 y1=70,
                                 line=dict(color="red", width=2, dash="dash")
                             )
                             
                             fig.add_shape(
                                 type="line",
-                                x0=df_with_indicators.index[0],
+                                x0=x0,
                                 y0=30,
-                                x1=df_with_indicators.index[-1],
+                                x1=x1,
                                 y1=30,
                                 line=dict(color="green", width=2, dash="dash")
                             )
@@ -370,13 +623,13 @@ try:
                             - **RSI < 30:** Le marché est potentiellement en survente (signal d'achat)
                             """)
                             
-                        elif indicator == "MACD" and all(x in df_with_indicators.columns for x in ['MACD', 'MACD_signal', 'MACD_hist']):
+                        elif indicator == "MACD" and all(x in chart_indicators.columns for x in ['MACD', 'MACD_signal', 'MACD_hist']):
                             fig = make_subplots(specs=[[{"secondary_y": True}]])
                             
                             fig.add_trace(
                                 go.Scatter(
-                                    x=df_with_indicators.index,
-                                    y=df_with_indicators['MACD'],
+                                    x=chart_indicators.index,
+                                    y=chart_indicators['MACD'],
                                     mode='lines',
                                     name='MACD'
                                 )
@@ -384,8 +637,8 @@ try:
                             
                             fig.add_trace(
                                 go.Scatter(
-                                    x=df_with_indicators.index,
-                                    y=df_with_indicators['MACD_signal'],
+                                    x=chart_indicators.index,
+                                    y=chart_indicators['MACD_signal'],
                                     mode='lines',
                                     name='Signal'
                                 )
@@ -393,12 +646,10 @@ try:
                             
                             fig.add_trace(
                                 go.Bar(
-                                    x=df_with_indicators.index,
-                                    y=df_with_indicators['MACD_hist'],
+                                    x=chart_indicators.index,
+                                    y=chart_indicators['MACD_hist'],
                                     name='Histogramme',
-                                    marker_color=df_with_indicators['MACD_hist'].apply(
-                                        lambda x: 'green' if x > 0 else 'red'
-                                    )
+                                    marker_color=np.where(chart_indicators['MACD_hist'].to_numpy() > 0, 'green', 'red')
                                 ),
                                 secondary_y=True
                             )
@@ -422,35 +673,35 @@ try:
                             - **Histogramme négatif (rouge):** Tendance baissière
                             """)
                             
-                        elif indicator == "Bollinger Bands" and all(x in df_with_indicators.columns for x in ['BB_upper', 'BB_middle', 'BB_lower']):
+                        elif indicator == "Bollinger Bands" and all(x in chart_indicators.columns for x in ['BB_upper', 'BB_middle', 'BB_lower']):
                             fig = go.Figure()
                             
                             fig.add_trace(go.Scatter(
-                                x=df_with_indicators.index,
-                                y=df_with_indicators['close'],
+                                x=chart_indicators.index,
+                                y=chart_indicators['close'],
                                 mode='lines',
                                 name='Prix de clôture'
                             ))
                             
                             fig.add_trace(go.Scatter(
-                                x=df_with_indicators.index,
-                                y=df_with_indicators['BB_upper'],
+                                x=chart_indicators.index,
+                                y=chart_indicators['BB_upper'],
                                 mode='lines',
                                 line=dict(width=1, color='rgba(100, 100, 100, 0.8)'),
                                 name='Bande supérieure'
                             ))
                             
                             fig.add_trace(go.Scatter(
-                                x=df_with_indicators.index,
-                                y=df_with_indicators['BB_middle'],
+                                x=chart_indicators.index,
+                                y=chart_indicators['BB_middle'],
                                 mode='lines',
                                 line=dict(width=1, color='rgba(100, 100, 100, 0.5)'),
                                 name='Moyenne mobile'
                             ))
                             
                             fig.add_trace(go.Scatter(
-                                x=df_with_indicators.index,
-                                y=df_with_indicators['BB_lower'],
+                                x=chart_indicators.index,
+                                y=chart_indicators['BB_lower'],
                                 mode='lines',
                                 line=dict(width=1, color='rgba(100, 100, 100, 0.8)'),
                                 fill='tonexty',
@@ -477,6 +728,352 @@ try:
         else:
             st.error(f"Aucune donnée disponible pour {selected_crypto_for_chart}")
 
+@st.fragment
+def render_strategy_tab(available_cryptos):
+    """
+    Affiche l'onglet de stratégie d'investissement personnalisée
+    
+    Exécuté comme fragment Streamlit: modifier le portefeuille ou le profil de risque
+    ne relance que ce bloc.
+    
+    Args:
+        available_cryptos (list): Cryptomonnaies proposées dans le portefeuille
+    """
+    st.subheader("Stratégie d'Investissement Personnalisée")
+    
+    # Profil de risque
+    risk_profile = st.radio(
+        "Votre profil de risque",
+        ["Conservateur", "Modéré", "Agressif"],
+        index=1,
+        horizontal=True,
+        key="risk_profile_selector"
+    )
+    
+    # Conversion du profil en anglais pour l'API
+    risk_map = {"Conservateur": "conservative", "Modéré": "moderate", "Agressif": "aggressive"}
+    
+    # Portefeuille actuel (version simplifiée)
+    st.subheader("Votre portefeuille actuel")
+    
+    # Saisie du portefeuille dans un seul tableau éditable (un widget au lieu de trois par crypto)
+    portfolio_df = st.data_editor(
+        pd.DataFrame({"Crypto": pd.Series(dtype=object), "Quantité": pd.Series(dtype=float)}),
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Crypto": st.column_config.SelectboxColumn("Crypto", options=available_cryptos, required=True),
+            "Quantité": st.column_config.NumberColumn("Quantité", min_value=0.0, default=0.0)
+        },
+        key="portfolio_editor"
+    )
+    
+    # Ne garder que les lignes complètes avec une quantité positive
+    portfolio_df = portfolio_df.dropna()
+    portfolio_df = portfolio_df[portfolio_df["Quantité"] > 0]
+    portfolio = dict(zip(portfolio_df["Crypto"], portfolio_df["Quantité"].astype(float)))
+    
+    # Bouton pour générer la stratégie
+    if st.button("Générer une stratégie d'investissement"):
+        if portfolio:
+            with st.spinner("Génération de la stratégie en cours..."):
+                # Appel à l'API IA
+                strategy = _cached_investment_strategy(portfolio, risk_map[risk_profile])
+                
+                if strategy.erreur is None:
+                    # Affichage de la stratégie
+                    st.subheader("Évaluation du Portefeuille")
+                    st.write(strategy.evaluation_portefeuille)
+                    
+                    st.subheader("Allocation Recommandée")
+                    st.write(strategy.allocation_recommandee)
+                    
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        st.subheader("Cryptos à Considérer")
+                        cryptos_to_add = strategy.cryptos_a_ajouter
+                        for crypto in cryptos_to_add:
+                            st.markdown(f"- {crypto}")
+                    
+                    with col2:
+                        st.subheader("Cryptos à Reconsidérer")
+                        cryptos_to_sell = strategy.cryptos_a_vendre
+                        for crypto in cryptos_to_sell:
+                            st.markdown(f"- {crypto}")
+                    
+                    st.subheader("Stratégie à Court Terme")
+                    st.write(strategy.strategie_court_terme)
+                    
+                    st.subheader("Stratégie à Long Terme")
+                    st.write(strategy.strategie_long_terme)
+                    
+                    st.subheader("Gestion des Risques")
+                    st.write(strategy.gestion_risques)
+                    
+                    # Résumé
+                    st.subheader("Résumé de la Stratégie")
+                    st.info(strategy.resume)
+                    
+                    # Timestamp
+                    st.caption(f"Stratégie générée le {datetime.fromisoformat(strategy.timestamp).strftime('%d/%m/%Y à %H:%M')}")
+                else:
+                    st.error(f"Échec de la génération de stratégie: {strategy.erreur}")
+        else:
+            st.warning("Veuillez ajouter au moins une cryptomonnaie à votre portefeuille")
+
+@st.fragment
+def render_qa_tab():
+    """
+    Affiche l'onglet de questions-réponses avec le conseiller IA
+    
+    Exécuté comme fragment Streamlit: saisir une question ne relance que ce bloc.
+    """
+    st.subheader("Questions & Réponses")
+    
+    st.markdown("""
+    Posez une question à notre conseiller IA spécialisé en cryptomonnaies
+    et obtenez une réponse personnalisée basée sur les connaissances les plus récentes.
+    """)
+    
+    # Champ de texte pour la question
+    user_question = st.text_area(
+        "Votre question",
+        height=100,
+        placeholder="Exemple: Quelle est la différence entre Proof of Work et Proof of Stake?"
+    )
+    
+    # Contexte supplémentaire (optionnel)
+    show_context = st.checkbox("Ajouter du contexte supplémentaire")
+    
+    context = None
+    if show_context:
+        context_info = st.text_area(
+            "Contexte supplémentaire (optionnel)",
+            height=100,
+            placeholder="Ajoutez ici des informations supplémentaires pour mieux contextualiser votre question."
+        )
+        
+        if context_info:
+            context = {"contexte_utilisateur": context_info}
+    
+    # Bouton pour poser la question
+    if st.button("Poser la question") and user_question:
+        with st.spinner("Traitement de votre question..."):
+            # Appel à l'API IA
+            answer = _cached_ai_answer(user_question, context)
+            
+            # Affichage de la réponse
+            st.markdown("### Réponse:")
+            st.markdown(answer)
+            
+            # Timestamp
+            st.caption(f"Réponse générée le {datetime.now().strftime('%d/%m/%Y à %H:%M')}")
+    elif user_question == "":
+        st.info("Veuillez entrer une question pour obtenir une réponse.")
+
+# Initialiser l'agent IA (un par session: l'historique des conversations n'est pas partagé entre utilisateurs)
+ia_agent = st.session_state.setdefault("ia_agent", IAAgent())
+
+# Configuration de la page
+st.set_page_config(
+    page_title="Analyse de Cryptomonnaies",
+    page_icon="📈",
+    layout="wide",
+)
+
+# Titre et description
+st.title("📊 Plateforme d'Analyse de Cryptomonnaies de Alexis Adinguera")
+st.markdown("""
+Cette application analyse les tendances des cryptomonnaies et identifie des opportunités
+d'investissement en générant des signaux d'achat et de vente basés sur des indicateurs techniques.
+""")
+
+# Sidebar pour les options
+st.sidebar.header("Options d'Analyse")
+
+# Sélection de la période
+time_periods = {
+    "24 heures": "1d",
+    "7 jours": "7d",
+    "30 jours": "30d",
+    "90 jours": "90d"
+}
+selected_period = st.sidebar.selectbox(
+    "Période d'analyse",
+    list(time_periods.keys()),
+    index=1  # Default to 7 days
+)
+
+# Chargement des cryptomonnaies disponibles
+try:
+    default_cryptos = ["BTC", "ETH", "BNB", "XRP", "SOL"]
+    
+    # Charger l'historique des cryptos qui seront affichées (sélection courante, sinon celles par défaut)
+    # pendant la récupération de la liste (appels réseau indépendants qui se recouvrent au lieu de s'enchaîner)
+    prefetch_cryptos = st.session_state.get("selected_cryptos") or default_cryptos
+    with ThreadPoolExecutor(max_workers=min(8, len(prefetch_cryptos))) as executor:
+        for crypto in prefetch_cryptos:
+            executor.submit(_cached_fetch, crypto, time_periods[selected_period])
+        available_cryptos = _cached_available_cryptocurrencies()
+    
+    # Sélection des cryptomonnaies à analyser
+    selected_cryptos = st.sidebar.multiselect(
+        "Sélectionner les cryptomonnaies à analyser",
+        available_cryptos,
+        default=default_cryptos,
+        key="selected_cryptos"
+    )
+    
+    # Si aucune crypto n'est sélectionnée, utilisez les valeurs par défaut
+    if not selected_cryptos:
+        selected_cryptos = default_cryptos
+        st.sidebar.warning("Aucune crypto sélectionnée, utilisation des valeurs par défaut.")
+
+    # Sélection des indicateurs techniques
+    technical_indicators = st.sidebar.multiselect(
+        "Indicateurs techniques",
+        ["RSI", "MACD", "Bollinger Bands", "EMA", "SMA"],
+        default=["RSI", "MACD"]
+    )
+
+    # Bouton pour actualiser les données
+    if st.sidebar.button("Actualiser les données"):
+        st.rerun()
+
+    # Affichage du dernier rafraîchissement
+    st.sidebar.text(f"Dernière mise à jour: {datetime.now().strftime('%H:%M:%S')}")
+
+    # Chargement et analyse des données
+    with st.spinner("Chargement des données des cryptomonnaies..."):
+        # Obtenir la période en jours
+        period = time_periods[selected_period]
+        
+        # Variable pour détecter si on utilise des données de démonstration
+        using_demo_data = False
+        
+        # Récupérer les données de toutes les cryptos sélectionnées en parallèle
+        with ThreadPoolExecutor(max_workers=min(8, len(selected_cryptos))) as executor:
+            fetched_data = dict(zip(
+                selected_cryptos,
+                executor.map(lambda crypto: _cached_fetch(crypto, period), selected_cryptos)
+            ))
+        
+        all_crypto_data = {}
+        for crypto, crypto_data in fetched_data.items():
+            # Vérifier si le DataFrame est vide
+            if not crypto_data.empty:
+                all_crypto_data[crypto] = crypto_data
+                
+                # Vérifier si nous utilisons des données de démonstration (marquées par l'API)
+                using_demo_data = using_demo_data or crypto_data.attrs.get('demo', False)
+        
+        # Calculer une seule fois les indicateurs techniques, en parallèle, partagés par l'analyse, les onglets et la sauvegarde
+        with ThreadPoolExecutor(max_workers=min(8, max(1, len(all_crypto_data)))) as executor:
+            indicators_cache = dict(zip(
+                all_crypto_data,
+                executor.map(
+                    lambda item: _cached_indicators(item[0], item[1].index[-1], len(item[1]), float(item[1]['close'].iat[-1]), item[1]),
+                    all_crypto_data.items()
+                )
+            ))
+        
+        # Clé décrivant l'état des données: l'analyse n'est refaite que si une bougie ou la clôture en cours a changé
+        data_key = tuple(
+            (crypto, crypto_data.index[-1], len(crypto_data), float(crypto_data['close'].iat[-1]))
+            for crypto, crypto_data in all_crypto_data.items()
+        )
+        
+        # Identifier les cryptomonnaies prometteuses
+        promising_cryptos = _cached_promising(data_key, tuple(technical_indicators), all_crypto_data, indicators_cache)
+        
+        # Générer les signaux
+        signals = _cached_signals(data_key, tuple(technical_indicators), all_crypto_data, indicators_cache)
+        
+        # Avertissement pour les données de démonstration
+        if using_demo_data:
+            st.warning("""
+            **Mode démonstration activé** : L'API CoinGecko a atteint sa limite de requêtes. 
+            Nous utilisons des données de démonstration générées localement. 
+            Ces données ne reflètent pas les prix réels du marché mais vous permettent de continuer 
+            à explorer l'application. Veuillez réessayer plus tard pour obtenir des données en temps réel.
+            """)
+            
+            # Ajouter une indication du temps estimé avant que l'API soit à nouveau disponible
+            current_time = datetime.now()
+            # CoinGecko limite à 10-30 requêtes par minute pour les API gratuites
+            next_available = current_time + timedelta(minutes=1)
+            st.info(f"L'API devrait être à nouveau disponible vers {next_available.strftime('%H:%M')}.")
+
+    # Tableau de bord principal
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.header("Aperçu du Marché")
+        
+        # Créer un dataframe pour le tableau de marché (colonnes construites en un seul passage)
+        market_cryptos = [crypto for crypto, data in all_crypto_data.items() if not data.empty]
+        closes = [all_crypto_data[crypto]['close'] for crypto in market_cryptos]
+        current_prices = np.array([close.iat[-1] for close in closes], dtype=float)
+        prices_24h_ago = np.array([close.iat[-24] if len(close) > 24 else close.iat[0] for close in closes], dtype=float)
+        volumes_24h = np.array([all_crypto_data[crypto]['volume'].iat[-1] for crypto in market_cryptos], dtype=float)
+        changes_24h = (current_prices - prices_24h_ago) / prices_24h_ago * 100
+        
+        market_df = pd.DataFrame({
+            "Crypto": market_cryptos,
+            "Prix Actuel": format_currency_array(current_prices),
+            "Changement (24h)": changes_24h,
+            "Volume (24h)": format_currency_array(volumes_24h),
+            "Signal": [signals[crypto]['signal'] if crypto in signals else "Neutre" for crypto in market_cryptos]
+        })
+        
+        # Appliquer une couleur conditionnelle (colonne numérique traitée d'un seul bloc)
+        def color_change(values):
+            return np.where(
+                values > 0, 'background-color: rgba(0, 255, 0, 0.2)',
+                np.where(values < 0, 'background-color: rgba(255, 0, 0, 0.2)', '')
+            )
+        
+        def color_signal(values):
+            return np.select(
+                [values == "Achat", values == "Vente"],
+                [
+                    'background-color: rgba(0, 255, 0, 0.3); color: darkgreen; font-weight: bold',
+                    'background-color: rgba(255, 0, 0, 0.3); color: darkred; font-weight: bold'
+                ],
+                default=''
+            )
+        
+        # Afficher le tableau avec mise en forme (styles calculés par colonne entière)
+        st.dataframe(
+            market_df.style
+            .apply(color_change, subset=['Changement (24h)'])
+            .apply(color_signal, subset=['Signal'])
+            .format("{:.2f}%", subset=['Changement (24h)'])
+        )
+
+    with col2:
+        st.header("Cryptomonnaies Prometteuses")
+        
+        if promising_cryptos:
+            for idx, (crypto, score) in enumerate(promising_cryptos):
+                st.markdown(f"**{idx+1}. {crypto}** - Score: {score:.2f}")
+                if crypto in signals:
+                    signal_color = "green" if signals[crypto]['signal'] == "Achat" else "red" if signals[crypto]['signal'] == "Vente" else "gray"
+                    st.markdown(f"<span style='color:{signal_color};font-weight:bold;'>{signals[crypto]['signal']}</span> - {signals[crypto]['reason']}", unsafe_allow_html=True)
+        else:
+            st.info("Aucune cryptomonnaie particulièrement prometteuse n'a été identifiée pour le moment.")
+
+    # Création des onglets principaux pour l'application
+    main_tabs = st.tabs(["Analyse Graphique", "Trading", "Historique des Signaux", "Base de Données", "Conseiller IA", "Agent IA"])
+    
+    with main_tabs[0]:
+        st.header("Analyse Graphique")
+        
+        # Le fragment se réexécute seul lorsque l'utilisateur change de crypto
+        render_chart_tab(all_crypto_data, selected_cryptos, signals, technical_indicators, indicators_cache)
+
     # Section Analyse et Conseils
     st.header("Analyse et Conseils")
     
@@ -490,7 +1087,7 @@ try:
             
             if 'details' in signal_info and signal_info['details']:
                 with st.expander("Détails de l'analyse"):
-                    for key, value in signal_info['details'].items():
+                    for key, value in format_signal_details(signal_info['details']).items():
                         st.markdown(f"- **{key}:** {value}")
             
             if 'advice' in signal_info:
@@ -507,15 +1104,18 @@ try:
     """)
 
     # Sauvegarde dans la base de données
-    # 1. Sauvegarde des prix historiques et indicateurs techniques
-    for crypto, df in all_crypto_data.items():
-        if not df.empty:
-            # Sauvegarder l'historique des prix
-            save_price_history(crypto, df)
-            
-            # Calculer et sauvegarder les indicateurs techniques
-            df_with_indicators = calculate_technical_indicators(df)
-            save_technical_indicators(crypto, df_with_indicators)
+    # 1. Sauvegarde des prix historiques et indicateurs techniques (insertions groupées par cryptomonnaie)
+    # Ignorer les cryptos dont les données n'ont pas changé depuis la dernière sauvegarde
+    last_hashes = st.session_state.setdefault('_save_hashes', {})
+    new_hashes = {crypto: _data_hash(df) for crypto, df in all_crypto_data.items() if not df.empty}
+    changed_data = {crypto: all_crypto_data[crypto] for crypto, h in new_hashes.items() if last_hashes.get(crypto) != h}
+    
+    if changed_data:
+        saved_cryptos = save_market_data_bulk(
+            changed_data,
+            {crypto: _get_indicators(indicators_cache, crypto, df) for crypto, df in changed_data.items()}
+        )
+        last_hashes.update((crypto, new_hashes[crypto]) for crypto in saved_cryptos)
     
     # 2. Sauvegarde des signaux générés
     for crypto, signal_info in signals.items():
@@ -544,34 +1144,12 @@ try:
     save_user_preference("selected_cryptos", ",".join(selected_cryptos))
     save_user_preference("selected_indicators", ",".join(technical_indicators))
     
-    # Contenu de l'onglet d'analyse graphique
-    with main_tabs[0]:
-        st.header("Analyse Graphique")
-        
-        selected_crypto_for_chart = st.selectbox(
-            "Sélectionner une cryptomonnaie pour l'analyse graphique",
-            selected_cryptos,
-            key="crypto_chart_selector_tab"
-        )
-        
-        if selected_crypto_for_chart in all_crypto_data:
-            df = all_crypto_data[selected_crypto_for_chart]
-            
-            if not df.empty:
-                # Calculer les indicateurs techniques pour cette crypto
-                df_with_indicators = calculate_technical_indicators(df)
-                
-                # Créer un onglet pour chaque type de graphique
-                chart_tabs = st.tabs(["Prix", "Volume", "Indicateurs Techniques"])
-                
-                # [Le reste du code pour l'analyse graphique reste inchangé]
-    
     # Afficher les données de la base de données dans les onglets appropriés
     with main_tabs[1]:
         st.header("Trading")
         
         # Sélection de l'échange de crypto-monnaies
-        exchanges = get_available_exchanges()
+        exchanges = _cached_available_exchanges()
         selected_exchange = st.selectbox(
             "Choisir un échange",
             exchanges,
@@ -624,7 +1202,8 @@ try:
         if api_key_provided:
             with st.spinner("Connexion à l'échange..."):
                 api_key, api_secret = get_exchange_credentials(selected_exchange)
-                exchange = initialize_exchange(selected_exchange, api_key, api_secret, test_mode=True)
+                credentials_hash = _credentials_hash(api_key, api_secret)
+                exchange = _get_exchange(selected_exchange, api_key, api_secret, test_mode=True)
                 
                 if exchange:
                     st.success(f"Connecté avec succès à {selected_exchange}!")
@@ -632,7 +1211,7 @@ try:
                     # Afficher le solde du compte
                     try:
                         st.subheader("Solde du compte")
-                        balances = get_account_balance(exchange)
+                        balances = _cached_balances(selected_exchange, credentials_hash, exchange)
                         
                         if balances:
                             # Filtrer les soldes non-nuls
@@ -654,9 +1233,14 @@ try:
                     # Interface de trading
                     st.subheader("Passer un ordre")
                     
-                    # Récupérer les paires disponibles
+                    # Récupérer les paires disponibles (mises en cache)
+                    if st.button("Actualiser les paires et les prix"):
+                        _cached_pairs.clear()
+                        _cached_ticker.clear()
+                        st.session_state["force_refresh"] = True
+                    
                     try:
-                        available_pairs = get_available_pairs(exchange)
+                        available_pairs = _cached_pairs(selected_exchange, credentials_hash, exchange)
                         
                         if available_pairs:
                             # Sélectionner une paire
@@ -667,9 +1251,15 @@ try:
                                 key="pair_selector"
                             )
                             
+                            # Ne recharger les ordres en cours que si la paire change (ou sur demande)
+                            pair_key = (selected_exchange, selected_pair)
+                            refresh_pair = st.session_state.get("last_pair") != pair_key or st.session_state.pop("force_refresh", False)
+                            st.session_state["last_pair"] = pair_key
+                            
                             # Obtenir des informations sur la paire sélectionnée
                             if selected_pair:
-                                ticker_info = get_ticker(exchange, selected_pair)
+                                # Ticker relu à chaque exécution (le cache de 5 secondes évite un appel par interaction)
+                                ticker_info = _cached_ticker(selected_exchange, credentials_hash, selected_pair, exchange)
                                 
                                 if ticker_info:
                                     current_price = ticker_info.get('last', 0)
@@ -718,8 +1308,10 @@ try:
                                                 
                                                 if order:
                                                     st.success(f"Ordre placé avec succès: {order.get('id', 'N/A')}")
-                                                    # Sauvegarder l'ordre dans la base de données
-                                                    save_order_to_db(selected_exchange, order)
+                                                    # L'ordre est déjà sauvegardé par place_market_order / place_limit_order
+                                                    _cached_orders_from_db.clear()
+                                                    _cached_balances.clear()
+                                                    st.session_state["force_refresh"] = True
                                                     # Recharger la page pour afficher le nouvel ordre
                                                     st.rerun()
                                                 else:
@@ -730,24 +1322,16 @@ try:
                             # Afficher les ordres en cours
                             st.subheader("Ordres en cours")
                             try:
-                                open_orders = get_open_orders(exchange, selected_pair)
+                                # Rafraîchir les ordres au changement de paire, sur demande, ou au plus toutes les 15 secondes
+                                orders_age = time.time() - st.session_state.get("pair_open_orders_time", 0)
+                                if refresh_pair or "pair_open_orders" not in st.session_state or orders_age > _OPEN_ORDERS_REFRESH_INTERVAL:
+                                    st.session_state["pair_open_orders"] = get_open_orders(exchange, selected_pair)
+                                    st.session_state["pair_open_orders_time"] = time.time()
+                                open_orders = st.session_state["pair_open_orders"]
                                 
                                 if open_orders:
                                     # Créer un DataFrame à partir des ordres ouverts
-                                    orders_data = []
-                                    for order in open_orders:
-                                        orders_data.append({
-                                            "ID": order.get('id', 'N/A'),
-                                            "Paire": order.get('symbol', 'N/A'),
-                                            "Type": order.get('type', 'N/A'),
-                                            "Côté": order.get('side', 'N/A'),
-                                            "Quantité": order.get('amount', 0),
-                                            "Prix": order.get('price', 0) if order.get('price') else "Market",
-                                            "Statut": order.get('status', 'N/A'),
-                                            "Date": format_date(order.get('timestamp', 0)/1000) if order.get('timestamp') else 'N/A'
-                                        })
-                                    
-                                    orders_df = pd.DataFrame(orders_data)
+                                    orders_df = _orders_table(pd.DataFrame.from_records(open_orders))
                                     st.dataframe(orders_df, use_container_width=True)
                                     
                                     # Option d'annulation d'ordre
@@ -761,6 +1345,9 @@ try:
                                                         st.success(f"Ordre {selected_order_id} annulé avec succès!")
                                                         # Mettre à jour le statut de l'ordre dans la base de données
                                                         update_order_status_in_db(selected_exchange, selected_order_id, "canceled")
+                                                        _cached_orders_from_db.clear()
+                                                        _cached_balances.clear()
+                                                        st.session_state["force_refresh"] = True
                                                         # Recharger la page
                                                         st.rerun()
                                                     else:
@@ -776,24 +1363,11 @@ try:
                             st.subheader("Historique des ordres")
                             try:
                                 # Récupérer l'historique des ordres depuis la base de données
-                                orders_history = get_orders_from_db(exchange_id=selected_exchange, symbol=selected_pair, limit=20)
+                                orders_history = _cached_orders_from_db(selected_exchange, selected_pair, 20)
                                 
                                 if orders_history:
                                     # Créer un DataFrame à partir de l'historique des ordres
-                                    history_data = []
-                                    for order in orders_history:
-                                        history_data.append({
-                                            "ID": order.order_id,
-                                            "Paire": order.symbol,
-                                            "Type": order.type,
-                                            "Côté": order.side,
-                                            "Quantité": order.amount,
-                                            "Prix": order.price if order.price else "Market",
-                                            "Statut": order.status,
-                                            "Date": format_date(order.timestamp)
-                                        })
-                                    
-                                    history_df = pd.DataFrame(history_data)
+                                    history_df = _orders_table(pd.DataFrame.from_records(orders_history, columns=list(_ORDER_COLUMNS)))
                                     st.dataframe(history_df, use_container_width=True)
                                 else:
                                     st.info("Aucun historique d'ordre disponible.")
@@ -811,39 +1385,37 @@ try:
     with main_tabs[2]:
         st.header("Historique des Signaux")
         
-        # Récupérer les signaux récents
-        recent_signals = get_recent_signals(limit=20)
+        # Récupérer les signaux récents uniquement lorsque l'utilisateur les demande
+        # (le contenu des onglets est exécuté à chaque réexécution, même s'ils sont masqués)
+        recent_signals = None
+        if st.session_state.get("signals_loaded") or st.button("Charger les signaux"):
+            st.session_state["signals_loaded"] = True
+            recent_signals = get_recent_signals(limit=20)
         
         if recent_signals:
-            # Créer un DataFrame pour afficher les signaux
-            signals_data = []
-            for signal in recent_signals:
-                signal_info = {
-                    "Cryptomonnaie": signal.symbol,
-                    "Date": signal.timestamp.strftime("%d/%m/%Y %H:%M"),
-                    "Type": signal.signal_type.capitalize(),
-                    "Raison": signal.reason,
-                    "Prix": f"${signal.price_at_signal:.2f}" if signal.price_at_signal else "N/A"
-                }
-                signals_data.append(signal_info)
-            
-            signals_df = pd.DataFrame(signals_data)
+            # Créer un DataFrame pour afficher les signaux, puis formater colonne par colonne
+            signals_df = pd.DataFrame.from_records(
+                recent_signals,
+                columns=["id", "symbol", "timestamp", "signal_type", "reason", "price", "indicators_data"]
+            )
+            signals_df = pd.DataFrame({
+                "Cryptomonnaie": signals_df["symbol"],
+                "Date": signals_df["timestamp"].dt.strftime("%d/%m/%Y %H:%M"),
+                "Type": signals_df["signal_type"].str.capitalize(),
+                "Raison": signals_df["reason"],
+                "Prix": np.where(
+                    signals_df["price"].notna() & (signals_df["price"] != 0),
+                    np.char.mod("$%.2f", signals_df["price"].fillna(0).to_numpy()),
+                    "N/A"
+                )
+            })
             
-            # Fonction pour colorer les types de signaux
-            def color_signal_type(val):
-                if val == "Achat":
-                    return 'background-color: rgba(0, 255, 0, 0.3); color: darkgreen; font-weight: bold'
-                elif val == "Vente":
-                    return 'background-color: rgba(255, 0, 0, 0.3); color: darkred; font-weight: bold'
-                elif val == "Neutre":
-                    return 'background-color: rgba(100, 100, 100, 0.2); color: gray'
-                return ''
+            # Marquer le type de signal par une pastille de couleur, calculée une seule fois pour la colonne
+            signal_marks = signals_df["Type"].map({"Achat": "🟢", "Vente": "🔴", "Neutre": "⚪"})
+            signals_df["Type"] = (signal_marks + " " + signals_df["Type"]).fillna(signals_df["Type"])
             
-            # Afficher le tableau avec mise en forme
-            st.dataframe(
-                signals_df.style
-                .map(color_signal_type, subset=['Type'])
-            )
+            # Afficher le tableau sans Styler (aucun rappel Python par cellule)
+            st.dataframe(signals_df, hide_index=True, use_container_width=True)
             
             # Sélectionner un signal pour voir plus de détails
             if signals_df.shape[0] > 0:
@@ -865,10 +1437,10 @@ try:
                 # Afficher les données d'indicateurs si disponibles
                 if selected_signal.indicators_data:
                     st.subheader("Indicateurs techniques")
-                    indicators = json.loads(selected_signal.indicators_data) if isinstance(selected_signal.indicators_data, str) else selected_signal.indicators_data
-                    for key, value in indicators.items():
+                    indicators = _parse_indicators(selected_signal.id, selected_signal.indicators_data) if isinstance(selected_signal.indicators_data, str) else selected_signal.indicators_data
+                    for key, value in format_signal_details(indicators).items():
                         st.write(f"**{key}:** {value}")
-        else:
+        elif recent_signals is not None:
             st.info("Aucun signal n'a encore été enregistré dans la base de données.")
     
     with main_tabs[3]:
@@ -900,18 +1472,14 @@ try:
         with db_tabs[1]:
             st.subheader("Statistiques de la Base de Données")
             
-            # Récupérer les statistiques sur les signaux
-            session = database.Session()
-            
             try:
-                # Compter les signaux par type
-                achat_count = session.query(database.Signal).filter(database.Signal.signal_type == "achat").count()
-                vente_count = session.query(database.Signal).filter(database.Signal.signal_type == "vente").count()
-                neutre_count = session.query(database.Signal).filter(database.Signal.signal_type == "neutre").count()
-                
-                # Compter les entrées dans les autres tables
-                price_count = session.query(database.PriceHistory).count()
-                indicator_count = session.query(database.TechnicalIndicator).count()
+                # Récupérer les statistiques (mises en cache 60 secondes)
+                stats = _db_stats()
+                achat_count = stats["achat"]
+                vente_count = stats["vente"]
+                neutre_count = stats["neutre"]
+                price_count = stats["price_history"]
+                indicator_count = stats["technical_indicators"]
                 
                 # Afficher les statistiques
                 col1, col2, col3 = st.columns(3)
@@ -934,9 +1502,6 @@ try:
                 
             except Exception as e:
                 st.error(f"Erreur lors de la récupération des statistiques: {e}")
-            
-            finally:
-                session.close()
         
         with db_tabs[2]:
             st.subheader("Configuration de la Base de Données")
@@ -949,21 +1514,24 @@ try:
                 try:
                     cutoff_date = datetime.now() - timedelta(days=90)
                     
-                    # Supprimer les anciennes données de prix
-                    deleted_prices = session.query(database.PriceHistory).filter(database.PriceHistory.timestamp < cutoff_date).delete()
-                    
-                    # Supprimer les anciens indicateurs
-                    deleted_indicators = session.query(database.TechnicalIndicator).filter(database.TechnicalIndicator.timestamp < cutoff_date).delete()
-                    
-                    # Supprimer les anciens signaux
-                    deleted_signals = session.query(database.Signal).filter(database.Signal.timestamp < cutoff_date).delete()
+                    # Une seule transaction pour les trois suppressions (colonnes timestamp indexées),
+                    # exécutées comme requêtes DELETE directes sans passer par les objets de la session
+                    with session.begin():
+                        # Supprimer les anciennes données de prix
+                        deleted_prices = session.execute(delete(database.PriceHistory).where(database.PriceHistory.timestamp < cutoff_date)).rowcount
+                        
+                        # Supprimer les anciens indicateurs
+                        deleted_indicators = session.execute(delete(database.TechnicalIndicator).where(database.TechnicalIndicator.timestamp < cutoff_date)).rowcount
+                        
+                        # Supprimer les anciens signaux
+                        deleted_signals = session.execute(delete(database.Signal).where(database.Signal.timestamp < cutoff_date)).rowcount
                     
-                    session.commit()
+                    _db_stats.clear()
                     
                     st.success(f"Nettoyage terminé! Supprimé: {deleted_prices} données de prix, {deleted_indicators} indicateurs techniques, {deleted_signals} signaux.")
                     
                 except Exception as e:
-                    session.rollback()
+                    # La transaction est annulée automatiquement par session.begin()
                     st.error(f"Erreur lors du nettoyage de la base de données: {e}")
                 
                 finally:
@@ -1004,12 +1572,18 @@ try:
             
             # Afficher l'historique des conversations
             with st.expander("Historique des conversations"):
+                # Construire tout l'historique en un seul bloc HTML (un seul rendu au lieu de quatre par message)
+                history_parts = []
                 for message in ia_agent.get_conversation_history():
                     role_color = "blue" if message["role"] == "assistant" else "green"
-                    st.markdown(f"**{message['role'].capitalize()}** :")
-                    st.markdown(f"<div style='color: {role_color};'>{message['content']}</div>", unsafe_allow_html=True)
-                    st.caption(f"Le {datetime.fromisoformat(message['timestamp']).strftime('%d/%m/%Y à %H:%M')}")
-                    st.markdown("---")
+                    history_parts.append(
+                        f"<p><b>{html.escape(message['role'].capitalize())}</b> :</p>"
+                        f"<div style='color: {role_color};'>{html.escape(message['content'])}</div>"
+                        f"<small style='color: gray;'>Le {datetime.fromisoformat(message['timestamp']).strftime('%d/%m/%Y à %H:%M')}</small>"
+                        "<hr>"
+                    )
+                if history_parts:
+                    st.markdown("".join(history_parts), unsafe_allow_html=True)
         
         st.markdown("""
         Notre conseiller IA utilise l'intelligence artificielle d'OpenAI pour analyser les données de marché
@@ -1033,43 +1607,61 @@ try:
                 df = all_crypto_data[crypto_to_analyze]
                 
                 if not df.empty:
-                    # Calcul des indicateurs techniques
-                    df_with_indicators = calculate_technical_indicators(df)
-                    
-                    # Préparation des données pour l'IA
-                    crypto_data = {
-                        "symbol": crypto_to_analyze,
-                        "current_price": float(df['close'].iloc[-1]),
-                        "price_change_percentage_24h": float(((df['close'].iloc[-1] - df['close'].iloc[-24]) / df['close'].iloc[-24]) * 100) if len(df) > 24 else 0,
-                        "price_change_percentage_7d": float(((df['close'].iloc[-1] - df['close'].iloc[0]) / df['close'].iloc[0]) * 100),
-                        "market_cap": float(df['close'].iloc[-1] * df['volume'].iloc[-1] / 1000),  # Estimation simplifiée
-                        "total_volume": float(df['volume'].iloc[-1])
-                    }
+                    # Ne refaire la préparation que si la crypto ou ses données ont changé
+                    prep_key = (crypto_to_analyze, df.index[-1], len(df))
+                    if st.session_state.get("ai_prep_key") != prep_key:
+                        # Calcul des indicateurs techniques
+                        df_with_indicators = _get_indicators(indicators_cache, crypto_to_analyze, df)
+                        
+                        # Préparation des données pour l'IA
+                        crypto_data = {
+                            "symbol": crypto_to_analyze,
+                            "current_price": float(df['close'].iloc[-1]),
+                            "price_change_percentage_24h": float(((df['close'].iloc[-1] - df['close'].iloc[-24]) / df['close'].iloc[-24]) * 100) if len(df) > 24 else 0,
+                            "price_change_percentage_7d": float(((df['close'].iloc[-1] - df['close'].iloc[0]) / df['close'].iloc[0]) * 100),
+                            "market_cap": float(df['close'].iloc[-1] * df['volume'].iloc[-1] / 1000),  # Estimation simplifiée
+                            "total_volume": float(df['volume'].iloc[-1])
+                        }
+                        
+                        # Extraction des indicateurs techniques
+                        last_row = df_with_indicators.iloc[-1]
+                        technical_data = {
+                            indicator: float(last_row[indicator])
+                            for indicator in ['RSI', 'MACD', 'MACD_signal', 'BB_upper', 'BB_middle', 'BB_lower']
+                            if indicator in last_row.index
+                        }
+                        
+                        # Ajouter signal existant s'il est disponible
+                        if crypto_to_analyze in signals:
+                            technical_data["signal_existant"] = signals[crypto_to_analyze]['signal']
+                            technical_data["raison_signal"] = signals[crypto_to_analyze]['reason']
+                        
+                        st.session_state["ai_prep"] = (crypto_data, technical_data)
+                        st.session_state["ai_prep_key"] = prep_key
+                    crypto_data, technical_data = st.session_state["ai_prep"]
                     
-                    # Extraction des indicateurs techniques
-                    technical_data = {}
-                    for indicator in ['RSI', 'MACD', 'MACD_signal', 'BB_upper', 'BB_middle', 'BB_lower']:
-                        if indicator in df_with_indicators.columns:
-                            technical_data[indicator] = float(df_with_indicators[indicator].iloc[-1])
+                    # Boutons pour lancer l'analyse (la nouvelle analyse ignore le cache)
+                    col_analyze, col_force = st.columns(2)
+                    with col_analyze:
+                        analyze_clicked = st.button("Analyser avec l'IA")
+                    with col_force:
+                        force_clicked = st.button("Forcer nouvelle analyse", key="force_ai_analysis")
                     
-                    # Ajouter signal existant s'il est disponible
-                    if crypto_to_analyze in signals:
-                        technical_data["signal_existant"] = signals[crypto_to_analyze]['signal']
-                        technical_data["raison_signal"] = signals[crypto_to_analyze]['reason']
+                    if force_clicked:
+                        _cached_ai_analysis.clear()
                     
-                    # Bouton pour lancer l'analyse
-                    if st.button("Analyser avec l'IA"):
+                    if analyze_clicked or force_clicked:
                         with st.spinner("Analyse en cours par l'IA..."):
-                            # Appel à l'API IA
-                            analysis = analyze_crypto_data(crypto_data, technical_data)
+                            # Appel à l'API IA, mis en cache par contenu des données
+                            analysis = _cached_ai_analysis(json.dumps([crypto_data, technical_data], sort_keys=True))
                             
-                            if "erreur" not in analysis:
+                            if analysis.erreur is None:
                                 # Affichage des résultats
                                 col1, col2 = st.columns([2, 1])
                                 
                                 with col1:
                                     # Afficher la recommandation de manière bien visible
-                                    recommandation = analysis.get("recommandation", "indéterminée")
+                                    recommandation = analysis.recommandation
                                     rec_color = "green" if recommandation == "acheter" else "red" if recommandation == "vendre" else "orange"
                                     
                                     st.markdown(f"""
@@ -1079,32 +1671,32 @@ try:
                                     '255, 165, 0'
                                     }, 0.2); padding: 20px; border-radius: 5px;'>
                                     <h2 style='color: {rec_color}; margin: 0;'>Recommandation: {recommandation.upper()}</h2>
-                                    <p>Niveau de risque: {'⭐' * int(analysis.get('niveau_risque', 3))}</p>
+                                    <p>Niveau de risque: {'⭐' * int(analysis.niveau_risque)}</p>
                                     </div>
                                     """, unsafe_allow_html=True)
                                     
                                     st.subheader("Résumé")
-                                    st.write(analysis.get("resume", ""))
+                                    st.write(analysis.resume)
                                     
                                     st.subheader("Analyse du Marché")
-                                    st.write(analysis.get("analyse_marche", ""))
+                                    st.write(analysis.analyse_marche)
                                     
                                     st.subheader("Analyse Technique")
-                                    st.write(analysis.get("analyse_technique", ""))
+                                    st.write(analysis.analyse_technique)
                                 
                                 with col2:
                                     st.subheader("Perspectives")
                                     
                                     st.markdown("**Court terme (1-7 jours)**")
-                                    st.write(analysis.get("perspectives_court_terme", ""))
+                                    st.write(analysis.perspectives_court_terme)
                                     
                                     st.markdown("**Moyen terme (1-3 mois)**")
-                                    st.write(analysis.get("perspectives_moyen_terme", ""))
+                                    st.write(analysis.perspectives_moyen_terme)
                                 
                                 # Ajouter un timestamp pour l'analyse
-                                st.caption(f"Analyse générée le {datetime.fromisoformat(analysis.get('timestamp', datetime.now().isoformat())).strftime('%d/%m/%Y à %H:%M')}")
+                                st.caption(f"Analyse générée le {datetime.fromisoformat(analysis.timestamp).strftime('%d/%m/%Y à %H:%M')}")
                             else:
-                                st.error(f"Échec de l'analyse IA: {analysis.get('erreur', 'Erreur inconnue')}")
+                                st.error(f"Échec de l'analyse IA: {analysis.erreur}")
                 else:
                     st.error(f"Aucune donnée disponible pour {crypto_to_analyze}")
             else:
@@ -1113,14 +1705,23 @@ try:
         with ai_tabs[1]:
             st.subheader("Sentiment Global du Marché")
             
-            if st.button("Analyser le sentiment du marché"):
+            col_sentiment, col_force_sentiment = st.columns(2)
+            with col_sentiment:
+                sentiment_clicked = st.button("Analyser le sentiment du marché")
+            with col_force_sentiment:
+                force_sentiment_clicked = st.button("Forcer nouvelle analyse", key="force_market_sentiment")
+            
+            if force_sentiment_clicked:
+                _cached_market_sentiment.clear()
+            
+            if sentiment_clicked or force_sentiment_clicked:
                 with st.spinner("Analyse du sentiment du marché en cours..."):
-                    # Appel à l'API IA pour le sentiment du marché
-                    sentiment = get_market_sentiment()
+                    # Appel à l'API IA pour le sentiment du marché (mis en cache 10 minutes)
+                    sentiment = _cached_market_sentiment()
                     
-                    if "erreur" not in sentiment:
+                    if sentiment.erreur is None:
                         # Affichage du sentiment global
-                        sentiment_global = sentiment.get("sentiment_global", "neutre")
+                        sentiment_global = sentiment.sentiment_global
                         sentiment_color = "green" if sentiment_global == "haussier" else "red" if sentiment_global == "baissier" else "gray"
                         
                         st.markdown(f"""
@@ -1135,168 +1736,36 @@ try:
                         
                         # Facteurs clés
                         st.subheader("Facteurs Influençant le Marché")
-                        facteurs = sentiment.get("facteurs_cles", [])
+                        facteurs = sentiment.facteurs_cles
                         for facteur in facteurs:
                             st.markdown(f"- {facteur}")
                         
                         # Cryptomonnaies prometteuses
                         st.subheader("Cryptomonnaies Prometteuses")
-                        cryptos = sentiment.get("cryptos_prometteuses", [])
+                        cryptos = sentiment.cryptos_prometteuses
                         for crypto in cryptos:
                             st.markdown(f"- {crypto}")
                         
                         # Risques à surveiller
                         st.subheader("Risques à Surveiller")
-                        risques = sentiment.get("risques_a_surveiller", [])
+                        risques = sentiment.risques_a_surveiller
                         for risque in risques:
                             st.markdown(f"- {risque}")
                         
                         # Conseils généraux
                         st.subheader("Conseils Généraux")
-                        st.write(sentiment.get("conseils_generaux", ""))
+                        st.write(sentiment.conseils_generaux)
                         
                         # Timestamp
-                        st.caption(f"Analyse générée le {datetime.fromisoformat(sentiment.get('timestamp', datetime.now().isoformat())).strftime('%d/%m/%Y à %H:%M')}")
+                        st.caption(f"Analyse générée le {datetime.fromisoformat(sentiment.timestamp).strftime('%d/%m/%Y à %H:%M')}")
                     else:
-                        st.error(f"Échec de l'analyse du sentiment: {sentiment.get('erreur', 'Erreur inconnue')}")
+                        st.error(f"Échec de l'analyse du sentiment: {sentiment.erreur}")
         
         with ai_tabs[2]:
-            st.subheader("Stratégie d'Investissement Personnalisée")
-            
-            # Profil de risque
-            risk_profile = st.radio(
-                "Votre profil de risque",
-                ["Conservateur", "Modéré", "Agressif"],
-                index=1,
-                horizontal=True,
-                key="risk_profile_selector"
-            )
-            
-            # Conversion du profil en anglais pour l'API
-            risk_map = {"Conservateur": "conservative", "Modéré": "moderate", "Agressif": "aggressive"}
-            
-            # Portefeuille actuel (version simplifiée)
-            st.subheader("Votre portefeuille actuel")
-            
-            # Création dynamique de champs pour le portefeuille
-            portfolio = {}
-            
-            for i in range(5):  # Max 5 cryptos dans le portefeuille
-                cols = st.columns([2, 2, 1])
-                
-                with cols[0]:
-                    crypto = st.selectbox(
-                        f"Crypto #{i+1}",
-                        [""] + available_cryptos,
-                        key=f"portfolio_crypto_{i}"
-                    )
-                
-                if crypto:  # Seulement si une crypto est sélectionnée
-                    with cols[1]:
-                        amount = st.number_input(
-                            f"Quantité de {crypto}",
-                            min_value=0.0,
-                            value=0.0,
-                            key=f"portfolio_amount_{i}"
-                        )
-                    
-                    with cols[2]:
-                        if amount > 0:
-                            portfolio[crypto] = amount
-                            st.success("✓")
-            
-            # Bouton pour générer la stratégie
-            if st.button("Générer une stratégie d'investissement"):
-                if portfolio:
-                    with st.spinner("Génération de la stratégie en cours..."):
-                        # Appel à l'API IA
-                        strategy = generate_investment_strategy(portfolio, risk_map[risk_profile])
-                        
-                        if "erreur" not in strategy:
-                            # Affichage de la stratégie
-                            st.subheader("Évaluation du Portefeuille")
-                            st.write(strategy.get("evaluation_portefeuille", ""))
-                            
-                            st.subheader("Allocation Recommandée")
-                            st.write(strategy.get("allocation_recommandee", ""))
-                            
-                            col1, col2 = st.columns(2)
-                            
-                            with col1:
-                                st.subheader("Cryptos à Considérer")
-                                cryptos_to_add = strategy.get("cryptos_a_ajouter", [])
-                                for crypto in cryptos_to_add:
-                                    st.markdown(f"- {crypto}")
-                            
-                            with col2:
-                                st.subheader("Cryptos à Reconsidérer")
-                                cryptos_to_sell = strategy.get("cryptos_a_vendre", [])
-                                for crypto in cryptos_to_sell:
-                                    st.markdown(f"- {crypto}")
-                            
-                            st.subheader("Stratégie à Court Terme")
-                            st.write(strategy.get("strategie_court_terme", ""))
-                            
-                            st.subheader("Stratégie à Long Terme")
-                            st.write(strategy.get("strategie_long_terme", ""))
-                            
-                            st.subheader("Gestion des Risques")
-                            st.write(strategy.get("gestion_risques", ""))
-                            
-                            # Résumé
-                            st.subheader("Résumé de la Stratégie")
-                            st.info(strategy.get("resume", ""))
-                            
-                            # Timestamp
-                            st.caption(f"Stratégie générée le {datetime.fromisoformat(strategy.get('timestamp', datetime.now().isoformat())).strftime('%d/%m/%Y à %H:%M')}")
-                        else:
-                            st.error(f"Échec de la génération de stratégie: {strategy.get('erreur', 'Erreur inconnue')}")
-                else:
-                    st.warning("Veuillez ajouter au moins une cryptomonnaie à votre portefeuille")
+            render_strategy_tab(available_cryptos)
         
         with ai_tabs[3]:
-            st.subheader("Questions & Réponses")
-            
-            st.markdown("""
-            Posez une question à notre conseiller IA spécialisé en cryptomonnaies
-            et obtenez une réponse personnalisée basée sur les connaissances les plus récentes.
-            """)
-            
-            # Champ de texte pour la question
-            user_question = st.text_area(
-                "Votre question",
-                height=100,
-                placeholder="Exemple: Quelle est la différence entre Proof of Work et Proof of Stake?"
-            )
-            
-            # Contexte supplémentaire (optionnel)
-            show_context = st.checkbox("Ajouter du contexte supplémentaire")
-            
-            context = None
-            if show_context:
-                context_info = st.text_area(
-                    "Contexte supplémentaire (optionnel)",
-                    height=100,
-                    placeholder="Ajoutez ici des informations supplémentaires pour mieux contextualiser votre question."
-                )
-                
-                if context_info:
-                    context = {"contexte_utilisateur": context_info}
-            
-            # Bouton pour poser la question
-            if st.button("Poser la question") and user_question:
-                with st.spinner("Traitement de votre question..."):
-                    # Appel à l'API IA
-                    answer = ask_ai_advisor(user_question, context)
-                    
-                    # Affichage de la réponse
-                    st.markdown("### Réponse:")
-                    st.markdown(answer)
-                    
-                    # Timestamp
-                    st.caption(f"Réponse générée le {datetime.now().strftime('%d/%m/%Y à %H:%M')}")
-            elif user_question == "":
-                st.info("Veuillez entrer une question pour obtenir une réponse.")
+            render_qa_tab()
 
 except Exception as e:
     st.error(f"Une erreur s'est produite: {str(e)}")
@@ -1,8 +1,40 @@
+import heapq
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 from technical_indicators import calculate_technical_indicators
 
-def identify_promising_cryptocurrencies(crypto_data_dict, selected_indicators, top_n=5):
+def _precompute_indicators(crypto_data_dict, indicators_cache=None, selected_indicators=None):
+    """
+    Calcule en parallèle les indicateurs techniques manquants de chaque cryptomonnaie
+    
+    Args:
+        crypto_data_dict (dict): Dictionnaire des DataFrames de données par cryptomonnaie
+        indicators_cache (dict): Indicateurs déjà calculés {symbole: DataFrame} (optionnel, complété si fourni)
+        selected_indicators (list): Indicateurs sélectionnés, seuls calculés en l'absence de cache partagé
+        
+    Returns:
+        dict: Indicateurs techniques par cryptomonnaie (hors données vides)
+    """
+    # Un cache fourni par l'appelant est partagé (graphiques, sauvegarde): il reçoit tous les indicateurs
+    indicators = None
+    if indicators_cache is None:
+        indicators_cache = {}
+        indicators = selected_indicators
+    
+    missing = [crypto for crypto, data in crypto_data_dict.items() if not data.empty and crypto not in indicators_cache]
+    
+    # Les calculs pandas/NumPy libèrent le GIL: un pool de threads évite de sérialiser les DataFrames
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(8, len(missing))) as executor:
+            indicators_cache.update(zip(
+                missing,
+                executor.map(lambda crypto: calculate_technical_indicators(crypto_data_dict[crypto], indicators), missing)
+            ))
+    
+    return indicators_cache
+
+def identify_promising_cryptocurrencies(crypto_data_dict, selected_indicators, top_n=5, indicators_cache=None):
     """
     Identifie les cryptomonnaies les plus prometteuses en fonction des indicateurs techniques
     
@@ -10,137 +42,206 @@ def identify_promising_cryptocurrencies(crypto_data_dict, selected_indicators, t
         crypto_data_dict (dict): Dictionnaire des DataFrames de données par cryptomonnaie
         selected_indicators (list): Liste des indicateurs techniques sélectionnés
         top_n (int): Nombre de cryptomonnaies à retourner
+        indicators_cache (dict): Indicateurs déjà calculés par cryptomonnaie (optionnel)
         
     Returns:
         list: Liste des tuples (crypto, score) triés par score décroissant
     """
     scores = {}
     
+    # Calculer les indicateurs techniques manquants en parallèle (ou réutiliser ceux déjà calculés)
+    indicators_cache = _precompute_indicators(crypto_data_dict, indicators_cache, selected_indicators)
+    
     for crypto, data in crypto_data_dict.items():
         if data.empty:
             continue
         
-        # Calculer les indicateurs techniques
-        df = calculate_technical_indicators(data)
+        df = indicators_cache[crypto]
         
         # Calculer le score pour cette crypto
         score = calculate_crypto_score(df, selected_indicators)
         
         scores[crypto] = score
     
-    # Trier les cryptos par score décroissant
-    sorted_cryptos = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-    
-    # Retourner les top_n cryptos
-    return sorted_cryptos[:top_n]
+    # Retourner les top_n cryptos par score décroissant (sans trier toute la liste)
+    return heapq.nlargest(top_n, scores.items(), key=lambda x: x[1])
 
-def calculate_crypto_score(df, selected_indicators):
+def _back(values, n):
     """
-    Calcule un score pour une cryptomonnaie en fonction des indicateurs techniques
+    Retourne la n-ième valeur en partant de la fin d'un tableau, ou NaN si l'historique est trop court
     
     Args:
-        df (pandas.DataFrame): DataFrame avec les indicateurs techniques
-        selected_indicators (list): Liste des indicateurs techniques sélectionnés
+        values (numpy.ndarray): Valeurs de l'indicateur
+        n (int): Position depuis la fin (1 pour la dernière valeur)
         
+    Returns:
+        float: Valeur trouvée ou NaN
+    """
+    return values[-n] if values.size >= n else np.nan
+
+def _score_kernel(price_change: float, rsi: float,
+                  macd: float, macd_prev: float, macd_signal: float, macd_signal_prev: float,
+                  macd_hist: float, macd_hist_prev: float,
+                  close: float, close_prev: float, bb_lower: float, bb_lower_prev: float,
+                  ema_20: float, ema_20_prev: float, ema_50: float, ema_50_prev: float,
+                  sma_50: float, sma_50_back: float, sma_200: float, sma_200_back: float,
+                  volume_change: float) -> float:
+    """
+    Noyau numérique du score: applique les règles de notation à des valeurs scalaires.
+    
+    Purement scalaire et annoté pour pouvoir être compilé (mypyc/Cython). Un indicateur non
+    sélectionné ou un historique trop court est passé à NaN: toutes ses comparaisons sont
+    fausses et il ne rapporte aucun point.
+    
     Returns:
         float: Score calculé
     """
     score = 0.0
     
     # Points basés sur la tendance récente des prix
-    price_change = (df['close'].iloc[-1] / df['close'].iloc[0] - 1) * 100
     if price_change > 10:
         score += 2.0
     elif price_change > 5:
         score += 1.0
     elif price_change > 0:
         score += 0.5
-        
-    # Vérifier les indicateurs sélectionnés
-    if "RSI" in selected_indicators and "RSI" in df.columns:
-        rsi = df['RSI'].iloc[-1]
-        # RSI entre 40 et 60 indique un marché équilibré
-        if 40 <= rsi <= 60:
-            score += 0.5
-        # RSI entre 30 et 40 indique un marché potentiellement sous-évalué
-        elif 30 <= rsi < 40:
-            score += 1.0
-        # RSI < 30 indique un marché survente (opportunité d'achat)
-        elif rsi < 30:
-            score += 1.5
-    
-    if "MACD" in selected_indicators and all(col in df.columns for col in ['MACD', 'MACD_signal']):
-        # MACD au-dessus de la ligne de signal est positif
-        if df['MACD'].iloc[-1] > df['MACD_signal'].iloc[-1]:
-            score += 1.0
-        # Histogramme MACD en augmentation est positif
-        if df['MACD_hist'].iloc[-1] > df['MACD_hist'].iloc[-2]:
-            score += 0.5
-        # Croisement récent MACD au-dessus de la ligne de signal
-        if df['MACD'].iloc[-1] > df['MACD_signal'].iloc[-1] and df['MACD'].iloc[-2] <= df['MACD_signal'].iloc[-2]:
-            score += 1.5
-    
-    if "Bollinger Bands" in selected_indicators and all(col in df.columns for col in ['BB_upper', 'BB_middle', 'BB_lower']):
-        # Prix proche de la bande inférieure (potentiellement sous-évalué)
-        if df['close'].iloc[-1] < df['BB_lower'].iloc[-1] * 1.05:
-            score += 1.0
-        # Prix qui rebondit de la bande inférieure
-        if df['close'].iloc[-1] > df['close'].iloc[-2] and df['close'].iloc[-2] < df['BB_lower'].iloc[-2]:
-            score += 1.5
-    
-    if "EMA" in selected_indicators and "EMA_20" in df.columns and "EMA_50" in df.columns:
-        # EMA court terme au-dessus de EMA moyen terme (tendance haussière)
-        if df['EMA_20'].iloc[-1] > df['EMA_50'].iloc[-1]:
-            score += 1.0
-        # Croisement récent de EMA court terme au-dessus de EMA moyen terme
-        if df['EMA_20'].iloc[-1] > df['EMA_50'].iloc[-1] and df['EMA_20'].iloc[-2] <= df['EMA_50'].iloc[-2]:
-            score += 1.5
-    
-    if "SMA" in selected_indicators and "SMA_50" in df.columns and "SMA_200" in df.columns:
-        # Prix au-dessus des deux SMA (tendance haussière)
-        if df['close'].iloc[-1] > df['SMA_50'].iloc[-1] and df['close'].iloc[-1] > df['SMA_200'].iloc[-1]:
-            score += 1.0
-        # SMA 50 au-dessus de SMA 200 (tendance haussière à moyen terme)
-        if df['SMA_50'].iloc[-1] > df['SMA_200'].iloc[-1]:
-            score += 1.0
-        # Croisement récent (Golden Cross) de SMA 50 au-dessus de SMA 200
-        if df['SMA_50'].iloc[-1] > df['SMA_200'].iloc[-1] and df['SMA_50'].iloc[-20] <= df['SMA_200'].iloc[-20]:
-            score += 2.0
+    
+    # RSI entre 40 et 60 (marché équilibré), entre 30 et 40 (sous-évalué) ou < 30 (survente)
+    if 40 <= rsi <= 60:
+        score += 0.5
+    elif 30 <= rsi < 40:
+        score += 1.0
+    elif rsi < 30:
+        score += 1.5
+    
+    # MACD au-dessus de la ligne de signal, histogramme en augmentation, croisement récent
+    if macd > macd_signal:
+        score += 1.0
+    if macd_hist > macd_hist_prev:
+        score += 0.5
+    if macd > macd_signal and macd_prev <= macd_signal_prev:
+        score += 1.5
+    
+    # Prix proche de la bande inférieure, puis prix qui rebondit de la bande inférieure
+    if close < bb_lower * 1.05:
+        score += 1.0
+    if close > close_prev and close_prev < bb_lower_prev:
+        score += 1.5
+    
+    # EMA court terme au-dessus de EMA moyen terme, et croisement récent
+    if ema_20 > ema_50:
+        score += 1.0
+    if ema_20 > ema_50 and ema_20_prev <= ema_50_prev:
+        score += 1.5
+    
+    # Prix au-dessus des deux SMA, SMA 50 au-dessus de SMA 200, Golden Cross récent
+    if close > sma_50 and close > sma_200:
+        score += 1.0
+    if sma_50 > sma_200:
+        score += 1.0
+    if sma_50 > sma_200 and sma_50_back <= sma_200_back:
+        score += 2.0
     
     # Volume en augmentation est généralement positif
-    try:
-        volume_mean = df['volume'].rolling(window=7).mean().iloc[-1]
-        if volume_mean > 0:  # Éviter la division par zéro
-            volume_change = (df['volume'].iloc[-1] / volume_mean)
-            if volume_change > 1.5:
-                score += 1.0
-            elif volume_change > 1.2:
-                score += 0.5
-    except (ZeroDivisionError, ValueError, IndexError):
-        # Ignorer les erreurs liées au calcul du volume
-        pass
+    if volume_change > 1.5:
+        score += 1.0
+    elif volume_change > 1.2:
+        score += 0.5
     
     return score
 
-def generate_signals(crypto_data_dict, selected_indicators):
+def calculate_crypto_score(df, selected_indicators):
+    """
+    Calcule un score pour une cryptomonnaie en fonction des indicateurs techniques
+    
+    Args:
+        df (pandas.DataFrame): DataFrame avec les indicateurs techniques
+        selected_indicators (list): Liste des indicateurs techniques sélectionnés
+        
+    Returns:
+        float: Score calculé
+    """
+    nan = np.nan
+    
+    # Colonnes disponibles, calculées une seule fois pour tous les tests d'appartenance
+    columns = frozenset(df.columns)
+    
+    # Extraire une seule fois les colonnes utiles en tableaux NumPy (accès scalaire sans surcoût pandas)
+    arr = {
+        col: df[col].to_numpy()
+        for col in ('close', 'RSI', 'MACD', 'MACD_signal', 'MACD_hist', 'BB_lower',
+                    'EMA_20', 'EMA_50', 'SMA_50', 'SMA_200', 'volume')
+        if col in columns
+    }
+    close = arr['close']
+    
+    # Variation du prix sur toute la période
+    price_change = (close[-1] / close[0] - 1) * 100
+    
+    # Valeurs des indicateurs sélectionnés (NaN pour ceux qui ne le sont pas)
+    rsi = nan
+    if "RSI" in selected_indicators and "RSI" in columns:
+        rsi = arr['RSI'][-1]
+    
+    macd = macd_prev = macd_signal = macd_signal_prev = macd_hist = macd_hist_prev = nan
+    if "MACD" in selected_indicators and {'MACD', 'MACD_signal'} <= columns:
+        macd, macd_prev = arr['MACD'][-1], _back(arr['MACD'], 2)
+        macd_signal, macd_signal_prev = arr['MACD_signal'][-1], _back(arr['MACD_signal'], 2)
+        macd_hist, macd_hist_prev = arr['MACD_hist'][-1], _back(arr['MACD_hist'], 2)
+    
+    close_prev = bb_lower = bb_lower_prev = nan
+    if "Bollinger Bands" in selected_indicators and {'BB_upper', 'BB_middle', 'BB_lower'} <= columns:
+        close_prev = _back(close, 2)
+        bb_lower, bb_lower_prev = arr['BB_lower'][-1], _back(arr['BB_lower'], 2)
+    
+    ema_20 = ema_20_prev = ema_50 = ema_50_prev = nan
+    if "EMA" in selected_indicators and {'EMA_20', 'EMA_50'} <= columns:
+        ema_20, ema_20_prev = arr['EMA_20'][-1], _back(arr['EMA_20'], 2)
+        ema_50, ema_50_prev = arr['EMA_50'][-1], _back(arr['EMA_50'], 2)
+    
+    sma_50 = sma_50_back = sma_200 = sma_200_back = nan
+    if "SMA" in selected_indicators and {'SMA_50', 'SMA_200'} <= columns:
+        sma_50, sma_50_back = arr['SMA_50'][-1], _back(arr['SMA_50'], 20)
+        sma_200, sma_200_back = arr['SMA_200'][-1], _back(arr['SMA_200'], 20)
+    
+    # Volume de la dernière bougie rapporté à la moyenne des 7 dernières
+    volume = arr['volume']
+    volume_mean = volume[-7:].mean() if volume.size >= 7 else nan
+    volume_change = nan
+    if np.isfinite(volume_mean) and volume_mean > 0:  # Éviter la division par zéro
+        volume_change = volume[-1] / volume_mean
+    
+    return _score_kernel(
+        price_change, rsi,
+        macd, macd_prev, macd_signal, macd_signal_prev, macd_hist, macd_hist_prev,
+        close[-1], close_prev, bb_lower, bb_lower_prev,
+        ema_20, ema_20_prev, ema_50, ema_50_prev,
+        sma_50, sma_50_back, sma_200, sma_200_back,
+        volume_change
+    )
+
+def generate_signals(crypto_data_dict, selected_indicators, indicators_cache=None):
     """
     Génère des signaux d'achat/vente pour chaque cryptomonnaie
     
     Args:
         crypto_data_dict (dict): Dictionnaire des DataFrames de données par cryptomonnaie
         selected_indicators (list): Liste des indicateurs techniques sélectionnés
+        indicators_cache (dict): Indicateurs déjà calculés par cryptomonnaie (optionnel)
         
     Returns:
         dict: Dictionnaire des signaux par cryptomonnaie
     """
     signals = {}
     
+    # Calculer les indicateurs techniques manquants en parallèle (ou réutiliser ceux déjà calculés)
+    indicators_cache = _precompute_indicators(crypto_data_dict, indicators_cache, selected_indicators)
+    
     for crypto, data in crypto_data_dict.items():
         if data.empty:
             continue
         
-        # Calculer les indicateurs techniques
-        df = calculate_technical_indicators(data)
+        df = indicators_cache[crypto]
         
         # Calculer le signal consolidé
         signal, reason, details, advice = analyze_crypto(df, selected_indicators)
@@ -163,7 +264,8 @@ def analyze_crypto(df, selected_indicators):
         selected_indicators (list): Liste des indicateurs techniques sélectionnés
         
     Returns:
-        tuple: (signal, reason, details, advice)
+        tuple: (signal, reason, details, advice), les valeurs numériques de details étant brutes
+            (voir format_signal_details pour l'affichage)
     """
     # Compter les signaux d'achat et de vente
     buy_signals = 0
@@ -172,10 +274,21 @@ def analyze_crypto(df, selected_indicators):
     
     details = {}
     
+    # Colonnes disponibles, calculées une seule fois pour tous les tests d'appartenance
+    columns = frozenset(df.columns)
+    
+    # Extraire une seule fois les colonnes utiles en tableaux NumPy (dernières valeurs lues sans surcoût pandas)
+    arr = {
+        col: df[col].to_numpy()
+        for col in ('close', 'RSI', 'MACD', 'MACD_signal', 'MACD_hist', 'BB_upper', 'BB_lower',
+                    'EMA_20', 'EMA_50', 'SMA_50', 'SMA_200')
+        if col in columns
+    }
+    
     # Analyser le RSI
-    if "RSI" in selected_indicators and "RSI" in df.columns:
-        rsi = df['RSI'].iloc[-1]
-        details["RSI"] = f"{rsi:.2f}"
+    if "RSI" in selected_indicators and "RSI" in columns:
+        rsi = arr['RSI'][-1]
+        details["RSI"] = float(rsi)
         
         if rsi < 30:
             buy_signals += 1
@@ -188,20 +301,20 @@ def analyze_crypto(df, selected_indicators):
             details["RSI_signal"] = "Neutre"
     
     # Analyser le MACD
-    if "MACD" in selected_indicators and all(col in df.columns for col in ['MACD', 'MACD_signal']):
-        macd = df['MACD'].iloc[-1]
-        signal_line = df['MACD_signal'].iloc[-1]
-        hist = df['MACD_hist'].iloc[-1]
+    if "MACD" in selected_indicators and {'MACD', 'MACD_signal'} <= columns:
+        macd, macd_prev = arr['MACD'][-1], _back(arr['MACD'], 2)
+        signal_line, signal_line_prev = arr['MACD_signal'][-1], _back(arr['MACD_signal'], 2)
+        hist = arr['MACD_hist'][-1]
         
-        details["MACD"] = f"{macd:.2f}"
-        details["MACD_signal"] = f"{signal_line:.2f}"
-        details["MACD_hist"] = f"{hist:.2f}"
+        details["MACD"] = float(macd)
+        details["MACD_signal"] = float(signal_line)
+        details["MACD_hist"] = float(hist)
         
         # Croisement récent
-        if df['MACD'].iloc[-1] > df['MACD_signal'].iloc[-1] and df['MACD'].iloc[-2] <= df['MACD_signal'].iloc[-2]:
+        if macd > signal_line and macd_prev <= signal_line_prev:
             buy_signals += 1
             details["MACD_crossover"] = "Achat (croisement haussier)"
-        elif df['MACD'].iloc[-1] < df['MACD_signal'].iloc[-1] and df['MACD'].iloc[-2] >= df['MACD_signal'].iloc[-2]:
+        elif macd < signal_line and macd_prev >= signal_line_prev:
             sell_signals += 1
             details["MACD_crossover"] = "Vente (croisement baissier)"
         # Position actuelle
@@ -216,14 +329,14 @@ def analyze_crypto(df, selected_indicators):
             details["MACD_position"] = "Neutre"
     
     # Analyser les bandes de Bollinger
-    if "Bollinger Bands" in selected_indicators and all(col in df.columns for col in ['BB_upper', 'BB_middle', 'BB_lower']):
-        price = df['close'].iloc[-1]
-        upper = df['BB_upper'].iloc[-1]
-        lower = df['BB_lower'].iloc[-1]
+    if "Bollinger Bands" in selected_indicators and {'BB_upper', 'BB_middle', 'BB_lower'} <= columns:
+        price = arr['close'][-1]
+        upper = arr['BB_upper'][-1]
+        lower = arr['BB_lower'][-1]
         
-        details["Prix_actuel"] = f"{price:.2f}"
-        details["BB_upper"] = f"{upper:.2f}"
-        details["BB_lower"] = f"{lower:.2f}"
+        details["Prix_actuel"] = float(price)
+        details["BB_upper"] = float(upper)
+        details["BB_lower"] = float(lower)
         
         # Prix proche de la bande inférieure
         if price < lower * 1.05:
@@ -239,20 +352,19 @@ def analyze_crypto(df, selected_indicators):
             details["Bollinger"] = "Neutre (entre les bandes)"
     
     # Analyser les moyennes mobiles
-    if "SMA" in selected_indicators and "SMA_50" in df.columns and "SMA_200" in df.columns:
-        price = df['close'].iloc[-1]
-        sma_50 = df['SMA_50'].iloc[-1]
-        sma_200 = df['SMA_200'].iloc[-1]
+    if "SMA" in selected_indicators and {'SMA_50', 'SMA_200'} <= columns:
+        sma_50, sma_50_back = arr['SMA_50'][-1], _back(arr['SMA_50'], 20)
+        sma_200, sma_200_back = arr['SMA_200'][-1], _back(arr['SMA_200'], 20)
         
-        details["SMA_50"] = f"{sma_50:.2f}"
-        details["SMA_200"] = f"{sma_200:.2f}"
+        details["SMA_50"] = float(sma_50)
+        details["SMA_200"] = float(sma_200)
         
         # Golden Cross (SMA 50 croise au-dessus de SMA 200)
-        if sma_50 > sma_200 and df['SMA_50'].iloc[-20] <= df['SMA_200'].iloc[-20]:
+        if sma_50 > sma_200 and sma_50_back <= sma_200_back:
             buy_signals += 2
             details["SMA_crossover"] = "Achat fort (Golden Cross récent)"
         # Death Cross (SMA 50 croise en-dessous de SMA 200)
-        elif sma_50 < sma_200 and df['SMA_50'].iloc[-20] >= df['SMA_200'].iloc[-20]:
+        elif sma_50 < sma_200 and sma_50_back >= sma_200_back:
             sell_signals += 2
             details["SMA_crossover"] = "Vente forte (Death Cross récent)"
         # Position des moyennes mobiles
@@ -267,18 +379,18 @@ def analyze_crypto(df, selected_indicators):
             details["SMA_position"] = "Neutre"
     
     # Analyser l'EMA
-    if "EMA" in selected_indicators and "EMA_20" in df.columns and "EMA_50" in df.columns:
-        ema_20 = df['EMA_20'].iloc[-1]
-        ema_50 = df['EMA_50'].iloc[-1]
+    if "EMA" in selected_indicators and {'EMA_20', 'EMA_50'} <= columns:
+        ema_20, ema_20_prev = arr['EMA_20'][-1], _back(arr['EMA_20'], 2)
+        ema_50, ema_50_prev = arr['EMA_50'][-1], _back(arr['EMA_50'], 2)
         
-        details["EMA_20"] = f"{ema_20:.2f}"
-        details["EMA_50"] = f"{ema_50:.2f}"
+        details["EMA_20"] = float(ema_20)
+        details["EMA_50"] = float(ema_50)
         
         # Croisement récent
-        if ema_20 > ema_50 and df['EMA_20'].iloc[-2] <= df['EMA_50'].iloc[-2]:
+        if ema_20 > ema_50 and ema_20_prev <= ema_50_prev:
             buy_signals += 1
             details["EMA_crossover"] = "Achat (croisement haussier)"
-        elif ema_20 < ema_50 and df['EMA_20'].iloc[-2] >= df['EMA_50'].iloc[-2]:
+        elif ema_20 < ema_50 and ema_20_prev >= ema_50_prev:
             sell_signals += 1
             details["EMA_crossover"] = "Vente (croisement baissier)"
         # Position actuelle
@@ -319,3 +431,15 @@ def analyze_crypto(df, selected_indicators):
         advice = "Attendez un signal plus clair avant de prendre une décision. Surveillez de près l'évolution des indicateurs techniques."
     
     return signal, reason, details, advice
+
+def format_signal_details(details):
+    """
+    Formate les détails d'un signal pour l'affichage (valeurs numériques arrondies à 2 décimales)
+    
+    Args:
+        details (dict): Détails de l'analyse produits par analyze_crypto
+        
+    Returns:
+        dict: Détails avec les valeurs numériques formatées en texte
+    """
+    return {key: f"{value:.2f}" if isinstance(value, float) else value for key, value in details.items()}
@@ -1,8 +1,65 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import numpy as np
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from pathlib import Path
+
+# Délai maximal (en secondes) d'une requête à l'API
+REQUEST_TIMEOUT = 10
+
+# Durées de vie (en secondes) des prix actuels et de la liste des cryptomonnaies en cache
+PRICE_CACHE_TTL = 10
+LIST_CACHE_TTL = 3600
+
+# Limite de débit de l'API (appels par fenêtre glissante, en secondes)
+RATE_LIMIT_CALLS = 50
+RATE_LIMIT_WINDOW = 1.0
+
+# Répertoire du cache disque de l'historique OHLCV
+CACHE_DIR = Path.home() / ".crypto_cache"
+
+# Durée d'une bougie pour chaque intervalle de l'API
+INTERVAL_DURATIONS = {
+    "minute": pd.Timedelta(minutes=1),
+    "hour": pd.Timedelta(hours=1),
+    "day": pd.Timedelta(days=1)
+}
+
+# Agrégation OHLCV utilisée pour le rééchantillonnage
+_OHLCV_AGG = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum'
+}
+
+# Fréquences pandas des intervalles obtenus par rééchantillonnage
+_RESAMPLE_RULES = {
+    "5m": "5min",
+    "15m": "15min",
+    "4h": "4h"
+}
+
+def _cache_path(symbol, vs_currency, interval):
+    """
+    Retourne le chemin du fichier de cache de l'historique d'une cryptomonnaie
+    
+    Args:
+        symbol (str): Symbole de la cryptomonnaie (ex: BTC)
+        vs_currency (str): Devise de comparaison (ex: USD)
+        interval (str): Intervalle entre les points ('minute', 'hour', 'day')
+        
+    Returns:
+        Path: Chemin du fichier de cache
+    """
+    return CACHE_DIR / f"{symbol}_{vs_currency}_{interval}.pkl"
 
 class CryptoCompareAPI:
     """
@@ -22,6 +79,95 @@ class CryptoCompareAPI:
         
         if api_key:
             self.headers["authorization"] = f"Apikey {api_key}"
+        
+        # Session HTTP partagée: les connexions (TCP + TLS) sont réutilisées d'un appel à l'autre
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount("https://", adapter)
+        
+        # Caches en mémoire avec durée de vie: {clé: (horodatage, valeur)}
+        self._price_cache = {}
+        self._list_cache = {}
+        self._cache_lock = threading.Lock()
+        
+        # Limiteur de débit côté client: horodatages des derniers appels dans la fenêtre courante
+        self._calls = deque()
+        self._rate_lock = threading.Lock()
+    
+    def _rate_gate(self):
+        """
+        Attend si nécessaire pour ne pas dépasser RATE_LIMIT_CALLS appels par RATE_LIMIT_WINDOW secondes
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            
+            # Oublier les appels sortis de la fenêtre
+            while self._calls and now - self._calls[0] >= RATE_LIMIT_WINDOW:
+                self._calls.popleft()
+            
+            # Fenêtre pleine: attendre que l'appel le plus ancien en sorte
+            if len(self._calls) >= RATE_LIMIT_CALLS:
+                time.sleep(RATE_LIMIT_WINDOW - (now - self._calls[0]))
+                self._calls.popleft()
+            
+            self._calls.append(time.monotonic())
+    
+    def _get(self, url):
+        """
+        Effectue une requête GET sur l'API en respectant la limite de débit
+        
+        Args:
+            url (str): URL de la requête
+            
+        Returns:
+            requests.Response: Réponse de l'API
+        """
+        self._rate_gate()
+        return self.session.get(url, timeout=REQUEST_TIMEOUT)
+    
+    def _cache_get(self, cache, key, ttl):
+        """
+        Retourne une valeur du cache si elle a moins de ttl secondes
+        
+        Args:
+            cache (dict): Cache à consulter
+            key: Clé de la valeur
+            ttl (float): Durée de vie en secondes
+            
+        Returns:
+            Valeur en cache, ou None si absente ou expirée
+        """
+        with self._cache_lock:
+            entry = cache.get(key)
+        
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        return None
+    
+    def _cache_set(self, cache, key, value):
+        """
+        Enregistre une valeur dans le cache avec l'horodatage courant
+        
+        Args:
+            cache (dict): Cache à compléter
+            key: Clé de la valeur
+            value: Valeur à enregistrer
+        """
+        with self._cache_lock:
+            cache[key] = (time.monotonic(), value)
+    
+    def clear_cache(self):
+        """
+        Vide les caches des prix actuels et de la liste des cryptomonnaies
+        """
+        with self._cache_lock:
+            self._price_cache.clear()
+            self._list_cache.clear()
     
     def get_available_cryptos(self, limit=50):
         """
@@ -33,10 +179,14 @@ class CryptoCompareAPI:
         Returns:
             list: Liste des symboles de cryptomonnaies
         """
+        cached = self._cache_get(self._list_cache, limit, LIST_CACHE_TTL)
+        if cached is not None:
+            return list(cached)
+        
         try:
             # Obtenir la liste des cryptomonnaies
             url = f"{self.base_url}/top/mktcapfull?limit={limit}&tsym=USD"
-            response = requests.get(url, headers=self.headers)
+            response = self._get(url)
             response.raise_for_status()
             
             data = response.json()
@@ -54,16 +204,18 @@ class CryptoCompareAPI:
                 if symbol:
                     cryptos.append(symbol)
             
-            return cryptos
+            self._cache_set(self._list_cache, limit, cryptos)
+            
+            return list(cryptos)
             
         except Exception as e:
             print(f"Erreur lors de la récupération des cryptomonnaies disponibles: {e}")
             # Retourner une liste de cryptos par défaut en cas d'erreur
             return ["BTC", "ETH", "BNB", "SOL", "XRP", "ADA", "DOGE", "DOT", "MATIC", "AVAX", "ALPACA"]
     
-    def get_historical_data(self, symbol, vs_currency="USD", limit=2000, interval="hour"):
+    def _fetch_historical(self, symbol, vs_currency, limit, interval):
         """
-        Récupère les données historiques d'une cryptomonnaie
+        Télécharge les données historiques d'une cryptomonnaie depuis l'API
         
         Args:
             symbol (str): Symbole de la cryptomonnaie (ex: BTC)
@@ -74,50 +226,116 @@ class CryptoCompareAPI:
         Returns:
             pandas.DataFrame: DataFrame contenant les données OHLCV
         """
-        try:
-            # Mapper l'intervalle à l'endpoint correct
-            endpoint = "histohour"
-            if interval == "minute":
-                endpoint = "histominute"
-            elif interval == "day":
-                endpoint = "histoday"
-            
-            # Construire l'URL
-            url = f"{self.base_url}/{endpoint}?fsym={symbol}&tsym={vs_currency}&limit={limit}"
-            
-            # Faire la requête
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
+        # Mapper l'intervalle à l'endpoint correct
+        endpoint = "histohour"
+        if interval == "minute":
+            endpoint = "histominute"
+        elif interval == "day":
+            endpoint = "histoday"
+        
+        # Construire l'URL
+        url = f"{self.base_url}/{endpoint}?fsym={symbol}&tsym={vs_currency}&limit={limit}"
+        
+        # Faire la requête
+        response = self._get(url)
+        response.raise_for_status()
+        
+        data = response.json()
+        
+        if data.get("Response") == "Error":
+            raise Exception(data.get("Message", "Erreur inconnue de l'API"))
+        
+        # Extraire les données
+        historical_data = data.get("Data", [])
+        
+        if not historical_data:
+            return pd.DataFrame()
+        
+        # Créer le DataFrame
+        df = pd.DataFrame(historical_data)
+        
+        # Convertir les timestamps en datetime
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+        
+        # Renommer les colonnes pour correspondre à notre format
+        df = df.rename(columns={
+            'time': 'timestamp',
+            'open': 'open',
+            'high': 'high',
+            'low': 'low',
+            'close': 'close',
+            'volumefrom': 'volume'
+        })
+        
+        # Définir l'index
+        df.set_index('timestamp', inplace=True)
+        
+        return df
+    
+    def _load_cached_history(self, path):
+        """
+        Charge l'historique mis en cache sur disque
+        
+        Args:
+            path (Path): Chemin du fichier de cache
             
-            data = response.json()
+        Returns:
+            pandas.DataFrame: Historique en cache (vide si absent ou illisible)
+        """
+        if not path.exists():
+            return pd.DataFrame()
+        
+        try:
+            return pd.read_pickle(path)
+        except Exception as e:
+            print(f"Erreur lors de la lecture du cache {path}: {e}")
+            return pd.DataFrame()
+    
+    def get_historical_data(self, symbol, vs_currency="USD", limit=2000, interval="hour", use_cache=True):
+        """
+        Récupère les données historiques d'une cryptomonnaie
+        
+        Args:
+            symbol (str): Symbole de la cryptomonnaie (ex: BTC)
+            vs_currency (str): Devise de comparaison (ex: USD)
+            limit (int): Nombre de points de données à récupérer
+            interval (str): Intervalle entre les points ('minute', 'hour', 'day')
+            use_cache (bool): Réutiliser l'historique en cache sur disque et ne télécharger que les points manquants
             
-            if data.get("Response") == "Error":
-                raise Exception(data.get("Message", "Erreur inconnue de l'API"))
+        Returns:
+            pandas.DataFrame: DataFrame contenant les données OHLCV
+        """
+        try:
+            if not use_cache:
+                return self._fetch_historical(symbol, vs_currency, limit, interval)
             
-            # Extraire les données
-            historical_data = data.get("Data", [])
+            path = _cache_path(symbol, vs_currency, interval)
+            cached = self._load_cached_history(path)
             
-            if not historical_data:
-                return pd.DataFrame()
+            # L'API renvoie limit + 1 points: le cache n'est utile que s'il couvre toute la fenêtre
+            fetch_limit = limit
+            if len(cached) > limit:
+                # Les bougies passées ne changent plus: ne récupérer que celles postérieures au cache
+                now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+                missing = int(np.ceil((now - cached.index.max()) / INTERVAL_DURATIONS.get(interval, INTERVAL_DURATIONS["hour"])))
+                fetch_limit = min(limit, max(missing, 1))
             
-            # Créer le DataFrame
-            df = pd.DataFrame(historical_data)
+            new_data = self._fetch_historical(symbol, vs_currency, fetch_limit, interval)
             
-            # Convertir les timestamps en datetime
-            df['time'] = pd.to_datetime(df['time'], unit='s')
+            if new_data.empty:
+                return cached.iloc[-(limit + 1):] if len(cached) > limit else new_data
             
-            # Renommer les colonnes pour correspondre à notre format
-            df = df.rename(columns={
-                'time': 'timestamp',
-                'open': 'open',
-                'high': 'high',
-                'low': 'low',
-                'close': 'close',
-                'volumefrom': 'volume'
-            })
+            df = new_data
+            if fetch_limit < limit:
+                # La dernière bougie (en cours) est remplacée par sa version la plus récente
+                df = pd.concat([cached, new_data])
+                df = df[~df.index.duplicated(keep='last')].sort_index().iloc[-(limit + 1):]
             
-            # Définir l'index
-            df.set_index('timestamp', inplace=True)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                df.to_pickle(path)
+            except Exception as e:
+                print(f"Erreur lors de l'écriture du cache {path}: {e}")
             
             return df
             
@@ -143,6 +361,11 @@ class CryptoCompareAPI:
         Returns:
             dict: Dictionnaire des prix actuels {symbole: prix}
         """
+        cache_key = (tuple(sorted(symbols)), vs_currency)
+        cached = self._cache_get(self._price_cache, cache_key, PRICE_CACHE_TTL)
+        if cached is not None:
+            return dict(cached)
+        
         try:
             # Convertir la liste en string délimitée par des virgules
             fsyms = ",".join(symbols)
@@ -151,7 +374,7 @@ class CryptoCompareAPI:
             url = f"{self.base_url}/pricemulti?fsyms={fsyms}&tsyms={vs_currency}"
             
             # Faire la requête
-            response = requests.get(url, headers=self.headers)
+            response = self._get(url)
             response.raise_for_status()
             
             data = response.json()
@@ -164,7 +387,9 @@ class CryptoCompareAPI:
             for symbol, price_data in data.items():
                 prices[symbol] = price_data.get(vs_currency, 0)
             
-            return prices
+            self._cache_set(self._price_cache, cache_key, prices)
+            
+            return dict(prices)
             
         except Exception as e:
             print(f"Erreur lors de la récupération des prix actuels: {e}")
@@ -195,17 +420,9 @@ class CryptoCompareAPI:
         else:  # hour
             n_points = 168  # 7 jours
         
-        # Créer une série temporelle
-        end_time = pd.Timestamp.now()
-        
-        if interval == "minute":
-            timestamps = [end_time - pd.Timedelta(minutes=i) for i in range(n_points)]
-        elif interval == "day":
-            timestamps = [end_time - pd.Timedelta(days=i) for i in range(n_points)]
-        else:  # hour
-            timestamps = [end_time - pd.Timedelta(hours=i) for i in range(n_points)]
-            
-        timestamps.reverse()  # Mettre dans l'ordre chronologique
+        # Créer une série temporelle (dans l'ordre chronologique)
+        freq = {"minute": "1min", "day": "1D"}.get(interval, "1h")
+        timestamps = pd.date_range(end=pd.Timestamp.now(), periods=n_points, freq=freq)
         
         # Définir différents prix de base selon la crypto
         base_prices = {
@@ -229,38 +446,33 @@ class CryptoCompareAPI:
         trend = np.random.choice([-1, 1])  # Tendance aléatoire (haussière ou baissière)
         volatility = 0.03  # Volatilité de 3%
         
-        prices = []
-        volumes = []
-        current_price = base_price
+        # Marche aléatoire géométrique: tous les tirages en une seule opération par colonne
+        changes = np.random.normal(0.001 * trend, volatility, n_points)
+        closes = base_price * np.cumprod(1 + changes)
         
-        for i in range(n_points):
-            # Ajouter de la volatilité aléatoire avec une légère tendance
-            change = np.random.normal(0.001 * trend, volatility)
-            current_price *= (1 + change)
-            
-            # Données OHLCV
-            open_price = current_price * (1 + np.random.normal(0, 0.005))
-            high_price = max(open_price, current_price) * (1 + abs(np.random.normal(0, 0.01)))
-            low_price = min(open_price, current_price) * (1 - abs(np.random.normal(0, 0.01)))
-            
-            # Volume - dépend de la crypto
-            volume = base_price * 1000 * (1 + np.random.normal(0, 0.2))
-            
-            prices.append((open_price, high_price, low_price, current_price))
-            volumes.append(volume)
+        # Données OHLCV
+        opens = closes * (1 + np.random.normal(0, 0.005, n_points))
+        highs = np.maximum(opens, closes) * (1 + np.abs(np.random.normal(0, 0.01, n_points)))
+        lows = np.minimum(opens, closes) * (1 - np.abs(np.random.normal(0, 0.01, n_points)))
+        
+        # Volume - dépend de la crypto
+        volumes = base_price * 1000 * (1 + np.random.normal(0, 0.2, n_points))
         
         # Créer le DataFrame
         df = pd.DataFrame(
             {
-                'open': [p[0] for p in prices],
-                'high': [p[1] for p in prices],
-                'low': [p[2] for p in prices],
-                'close': [p[3] for p in prices],
+                'open': opens,
+                'high': highs,
+                'low': lows,
+                'close': closes,
                 'volume': volumes
             },
             index=timestamps
         )
         
+        # Marquer le DataFrame comme données de démonstration
+        df.attrs['demo'] = True
+        
         return df
     
     def _generate_demo_prices(self, symbols):
@@ -297,16 +509,13 @@ class CryptoCompareAPI:
             "NEAR": 5
         }
         
-        # Générer des prix avec une petite variation aléatoire
-        demo_prices = {}
-        for symbol in symbols:
-            # Récupérer le prix de base ou utiliser 100 comme valeur par défaut
-            base_price = base_prices.get(symbol, 100)
-            # Ajouter une variation aléatoire de -5% à +5%
-            variation = np.random.uniform(-0.05, 0.05)
-            demo_prices[symbol] = base_price * (1 + variation)
+        # Récupérer le prix de base ou utiliser 100 comme valeur par défaut
+        bases = np.fromiter((base_prices.get(symbol, 100) for symbol in symbols), dtype=np.float64, count=len(symbols))
+        
+        # Ajouter une variation aléatoire de -5% à +5% (un seul tirage pour toutes les cryptos)
+        variations = np.random.uniform(-0.05, 0.05, len(symbols))
         
-        return demo_prices
+        return dict(zip(symbols, (bases * (1 + variations)).tolist()))
 
 # Instancier l'API
 crypto_compare = CryptoCompareAPI()
@@ -359,26 +568,39 @@ def fetch_cryptocurrency_data(symbol, period="7d", interval="1h"):
     # Récupérer les données
     df = crypto_compare.get_historical_data(symbol, limit=limit, interval=api_interval)
     
+    # Conserver les métadonnées (ex: indicateur de données de démonstration) après rééchantillonnage
+    attrs = dict(df.attrs)
+    
     # Rééchantillonner si nécessaire
-    if interval in ["5m", "15m"] and not df.empty:
-        df = df.resample(interval).agg({
-            'open': 'first',
-            'high': 'max',
-            'low': 'min',
-            'close': 'last',
-            'volume': 'sum'
-        })
-    elif interval == "4h" and not df.empty:
-        df = df.resample("4h").agg({
-            'open': 'first',
-            'high': 'max',
-            'low': 'min',
-            'close': 'last',
-            'volume': 'sum'
-        })
+    if interval in _RESAMPLE_RULES and not df.empty:
+        df = df.resample(_RESAMPLE_RULES[interval]).agg(_OHLCV_AGG)
+    
+    df.attrs.update(attrs)
     
     return df
 
+def fetch_many_cryptocurrency_data(symbols, period="7d", interval="1h"):
+    """
+    Récupère en parallèle les données historiques de plusieurs cryptomonnaies
+    
+    Args:
+        symbols (list): Liste des symboles de cryptomonnaies
+        period (str): Période de temps ('1d', '7d', '30d', '90d')
+        interval (str): Intervalle de temps ('1m', '5m', '15m', '1h', '4h', '1d')
+        
+    Returns:
+        dict: Dictionnaire des DataFrames OHLCV {symbole: DataFrame}, dans l'ordre des symboles
+    """
+    if not symbols:
+        return {}
+    
+    # Les requêtes HTTP libèrent le GIL pendant l'attente réseau: les appels se recouvrent
+    with ThreadPoolExecutor(max_workers=min(10, len(symbols))) as executor:
+        return dict(zip(
+            symbols,
+            executor.map(lambda symbol: fetch_cryptocurrency_data(symbol, period, interval), symbols)
+        ))
+
 def fetch_current_prices(symbols):
     """
     Récupère les prix actuels pour une liste de cryptomonnaies
@@ -389,4 +611,10 @@ def fetch_current_prices(symbols):
     Returns:
         dict: Dictionnaire des prix actuels {symbole: prix}
     """
-    return crypto_compare.get_current_prices(symbols)
\ No newline at end of file
+    return crypto_compare.get_current_prices(symbols)
+
+def clear_api_cache():
+    """
+    Vide les caches des prix actuels et de la liste des cryptomonnaies
+    """
+    crypto_compare.clear_cache()
@@ -4,10 +4,14 @@
 from crypto_compare_api import (
     get_available_cryptocurrencies,
     fetch_cryptocurrency_data,
-    fetch_current_prices
+    fetch_many_cryptocurrency_data,
+    fetch_current_prices,
+    clear_api_cache
 )
 
 # Ces fonctions sont importées de crypto_compare_api.py et prêtes à être utilisées
 # get_available_cryptocurrencies() - Récupère la liste des cryptomonnaies disponibles
 # fetch_cryptocurrency_data(symbol, period, interval) - Récupère les données historiques
+# fetch_many_cryptocurrency_data(symbols, period, interval) - Récupère en parallèle les données de plusieurs cryptos
 # fetch_current_prices(symbols) - Récupère les prix actuels
+# clear_api_cache() - Vide les caches des prix actuels et de la liste des cryptos
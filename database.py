@@ -1,23 +1,44 @@
 import os
 import pandas as pd
+import numpy as np
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, JSON
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, DateTime, Boolean, JSON, Index, select, delete, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 
 # Créer le moteur de base de données SQLite
 DATABASE_URL = "sqlite:///crypto_analysis.db"
 engine = create_engine(DATABASE_URL)
 
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Active le journal WAL de SQLite sur chaque nouvelle connexion
+    (écritures ajoutées au journal, lectures non bloquées pendant les écritures)
+    
+    En mode WAL, synchronous=NORMAL ne synchronise le disque qu'aux points de contrôle
+    au lieu de chaque validation, les tables temporaires restent en mémoire et le cache
+    de pages est porté à 64 Mo.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
 # Créer une classe de base pour nos modèles
 Base = declarative_base()
 
 # Définir les modèles de base de données
 class PriceHistory(Base):
     __tablename__ = "price_history"
+    # Index composite: filtre par symbole et parcours par date en une seule passe
+    __table_args__ = (Index("ix_price_history_symbol_timestamp", "symbol", "timestamp"),)
     
     id = Column(Integer, primary_key=True)
-    symbol = Column(String, nullable=False, index=True)
+    symbol = Column(String, nullable=False)
     timestamp = Column(DateTime, nullable=False, index=True)
     open = Column(Float, nullable=False)
     high = Column(Float, nullable=False)
@@ -30,9 +51,11 @@ class PriceHistory(Base):
 
 class TechnicalIndicator(Base):
     __tablename__ = "technical_indicators"
+    # Index composite: filtre par symbole et parcours par date en une seule passe
+    __table_args__ = (Index("ix_technical_indicators_symbol_timestamp", "symbol", "timestamp"),)
     
     id = Column(Integer, primary_key=True)
-    symbol = Column(String, nullable=False, index=True)
+    symbol = Column(String, nullable=False)
     timestamp = Column(DateTime, nullable=False, index=True)
     indicator_name = Column(String, nullable=False, index=True)
     value = Column(Float, nullable=False)
@@ -57,6 +80,8 @@ class Signal(Base):
 
 class UserPreference(Base):
     __tablename__ = "user_preferences"
+    # Une seule valeur par préférence et par utilisateur (cible de l'UPSERT)
+    __table_args__ = (Index("ux_user_preferences_user_name", "user_id", "preference_name", unique=True),)
     
     id = Column(Integer, primary_key=True)
     user_id = Column(String, nullable=False, index=True, default="default")
@@ -68,10 +93,16 @@ class UserPreference(Base):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Recherche d'un ordre précis (mise à jour du statut)
+        Index("ix_orders_exchange_order", "exchange_id", "order_id"),
+        # Derniers ordres d'un échange, déjà triés par date
+        Index("ix_orders_exchange_timestamp", "exchange_id", "timestamp"),
+    )
     
     id = Column(Integer, primary_key=True)
-    exchange_id = Column(String, nullable=False, index=True)
-    order_id = Column(String, nullable=False, index=True)
+    exchange_id = Column(String, nullable=False)
+    order_id = Column(String, nullable=False)
     symbol = Column(String, nullable=False, index=True)
     type = Column(String, nullable=False)  # 'market', 'limit', etc.
     side = Column(String, nullable=False)  # 'buy', 'sell'
@@ -84,12 +115,52 @@ class Order(Base):
     def __repr__(self):
         return f"<Order(exchange='{self.exchange_id}', id='{self.order_id}', symbol='{self.symbol}', status='{self.status}')>"
 
+class AIAnalysis(Base):
+    __tablename__ = "ai_analyses"
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String, nullable=False, index=True, default="default")
+    symbol = Column(String, nullable=False, index=True)
+    timestamp = Column(DateTime, nullable=False, index=True)
+    analysis_data = Column(JSON, nullable=True)  # Résultat complet de l'analyse IA
+    
+    def __repr__(self):
+        return f"<AIAnalysis(user='{self.user_id}', symbol='{self.symbol}', timestamp='{self.timestamp}')>"
+
 # Créer les tables dans la base de données
 def init_db():
-    Base.metadata.create_all(engine)
+    Base.metadata.create_all(engine, checkfirst=True)
+    
+    # Les anciennes bases peuvent contenir des préférences en double (lecture puis insertion concurrentes):
+    # ne garder que la plus récente, sinon l'index unique (cible de l'UPSERT) ne peut pas être créé
+    try:
+        with engine.begin() as connection:
+            connection.execute(
+                delete(UserPreference).where(UserPreference.id.not_in(
+                    select(func.max(UserPreference.id)).group_by(UserPreference.user_id, UserPreference.preference_name)
+                ))
+            )
+    except Exception as e:
+        print(f"Erreur lors de la suppression des préférences en double: {e}")
+    
+    # create_all ne complète pas les tables existantes: ajouter les index manquants
+    for table in (PriceHistory.__table__, TechnicalIndicator.__table__, UserPreference.__table__, Order.__table__):
+        for index in table.indexes:
+            try:
+                index.create(engine, checkfirst=True)
+            except Exception as e:
+                print(f"Erreur lors de la création de l'index {index.name}: {e}")
 
 # Créer une session pour interagir avec la base de données
-Session = sessionmaker(bind=engine)
+# (une session réutilisée par thread; les objets restent lisibles après validation sans nouvelle requête)
+Session = scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
+
+# Colonnes d'indicateurs techniques persistées dans la base de données
+INDICATOR_COLUMNS = [
+    'RSI', 'MACD', 'MACD_signal', 'MACD_hist',
+    'BB_upper', 'BB_middle', 'BB_lower',
+    'EMA_5', 'EMA_20', 'SMA_50', 'SMA_200'
+]
 
 # Fonctions pour interagir avec la base de données
 def save_price_history(symbol, df):
@@ -100,36 +171,19 @@ def save_price_history(symbol, df):
         symbol (str): Symbole de la cryptomonnaie
         df (pandas.DataFrame): DataFrame contenant les données OHLCV
     """
-    session = Session()
-    
     try:
         # Supprimer les anciennes données pour ce symbole (optionnel)
         # session.query(PriceHistory).filter(PriceHistory.symbol == symbol).delete()
         
-        # Préparer les nouveaux enregistrements
-        records = []
-        for index, row in df.iterrows():
-            price_record = PriceHistory(
-                symbol=symbol,
-                timestamp=index,
-                open=row['open'],
-                high=row['high'],
-                low=row['low'],
-                close=row['close'],
-                volume=row['volume']
-            )
-            records.append(price_record)
+        # Insertion groupée (executemany) sans passer par les objets ORM
+        rows = _price_history_rows(symbol, df)
         
-        # Ajouter les enregistrements
-        session.bulk_save_objects(records)
-        session.commit()
+        if rows:
+            with engine.begin() as connection:
+                connection.execute(PriceHistory.__table__.insert(), rows)
         
     except Exception as e:
-        session.rollback()
         print(f"Erreur lors de la sauvegarde des prix pour {symbol}: {e}")
-    
-    finally:
-        session.close()
 
 def save_technical_indicators(symbol, df):
     """
@@ -139,40 +193,112 @@ def save_technical_indicators(symbol, df):
         symbol (str): Symbole de la cryptomonnaie
         df (pandas.DataFrame): DataFrame contenant les indicateurs techniques
     """
-    session = Session()
-    
     try:
-        # Liste des colonnes d'indicateurs techniques à sauvegarder
-        indicator_columns = [
-            'RSI', 'MACD', 'MACD_signal', 'MACD_hist',
-            'BB_upper', 'BB_middle', 'BB_lower',
-            'EMA_5', 'EMA_20', 'SMA_50', 'SMA_200'
-        ]
-        
-        # Préparer les enregistrements
-        records = []
-        for index, row in df.iterrows():
-            for indicator in indicator_columns:
-                if indicator in df.columns and not pd.isna(row.get(indicator)):
-                    indicator_record = TechnicalIndicator(
-                        symbol=symbol,
-                        timestamp=index,
-                        indicator_name=indicator,
-                        value=float(row[indicator])
-                    )
-                    records.append(indicator_record)
-        
-        # Ajouter les enregistrements
-        if records:
-            session.bulk_save_objects(records)
-            session.commit()
+        # Une passe vectorisée par indicateur, puis une insertion groupée (executemany)
+        rows = _technical_indicator_rows(symbol, df)
+        
+        if rows:
+            with engine.begin() as connection:
+                connection.execute(TechnicalIndicator.__table__.insert(), rows)
         
     except Exception as e:
-        session.rollback()
         print(f"Erreur lors de la sauvegarde des indicateurs pour {symbol}: {e}")
+
+def _price_history_rows(symbol, df):
+    """
+    Prépare les lignes d'historique des prix d'une cryptomonnaie pour une insertion groupée
     
-    finally:
-        session.close()
+    Args:
+        symbol (str): Symbole de la cryptomonnaie
+        df (pandas.DataFrame): DataFrame contenant les données OHLCV
+        
+    Returns:
+        list: Liste de dictionnaires prêts à être insérés
+    """
+    return [
+        {
+            "symbol": symbol,
+            "timestamp": timestamp,
+            "open": open_price,
+            "high": high_price,
+            "low": low_price,
+            "close": close_price,
+            "volume": volume
+        }
+        for timestamp, open_price, high_price, low_price, close_price, volume in zip(
+            pd.DatetimeIndex(df.index).to_pydatetime(),
+            df['open'].tolist(),
+            df['high'].tolist(),
+            df['low'].tolist(),
+            df['close'].tolist(),
+            df['volume'].tolist()
+        )
+    ]
+
+def _technical_indicator_rows(symbol, df):
+    """
+    Prépare les lignes d'indicateurs techniques d'une cryptomonnaie pour une insertion groupée
+    
+    Args:
+        symbol (str): Symbole de la cryptomonnaie
+        df (pandas.DataFrame): DataFrame contenant les indicateurs techniques
+        
+    Returns:
+        list: Liste de dictionnaires prêts à être insérés (valeurs manquantes ignorées)
+    """
+    timestamps = pd.DatetimeIndex(df.index).to_pydatetime()
+    rows = []
+    
+    for indicator in INDICATOR_COLUMNS:
+        if indicator in df.columns:
+            values = df[indicator].to_numpy(dtype=float)
+            mask = ~np.isnan(values)
+            rows.extend(
+                {"symbol": symbol, "timestamp": timestamp, "indicator_name": indicator, "value": value}
+                for timestamp, value in zip(timestamps[mask], values[mask].tolist())
+            )
+    
+    return rows
+
+def save_market_data_bulk(price_data, indicators_data):
+    """
+    Sauvegarde l'historique des prix et les indicateurs techniques de plusieurs cryptomonnaies
+    (une insertion groupée par cryptomonnaie et par table, chacune dans sa propre transaction
+    pour qu'une erreur sur une cryptomonnaie n'annule pas la sauvegarde des autres)
+    
+    Args:
+        price_data (dict): Dictionnaire {symbole: DataFrame OHLCV}
+        indicators_data (dict): Dictionnaire {symbole: DataFrame avec indicateurs techniques}
+        
+    Returns:
+        list: Symboles dont les prix et les indicateurs ont été sauvegardés
+    """
+    saved_symbols = []
+    
+    for symbol in dict.fromkeys([*price_data, *indicators_data]):
+        saved = True
+        
+        for table, data, build_rows in (
+            (PriceHistory.__table__, price_data, _price_history_rows),
+            (TechnicalIndicator.__table__, indicators_data, _technical_indicator_rows)
+        ):
+            df = data.get(symbol)
+            if df is None or df.empty:
+                continue
+            
+            try:
+                rows = build_rows(symbol, df)
+                if rows:
+                    with engine.begin() as connection:
+                        connection.execute(table.insert(), rows)
+            except Exception as e:
+                print(f"Erreur lors de la sauvegarde groupée ({table.name}) pour {symbol}: {e}")
+                saved = False
+        
+        if saved:
+            saved_symbols.append(symbol)
+    
+    return saved_symbols
 
 def save_signal(symbol, signal_type, reason, indicators_data=None, price_at_signal=None):
     """
@@ -219,24 +345,17 @@ def save_user_preference(preference_name, preference_value, user_id="default"):
     session = Session()
     
     try:
-        # Vérifier si la préférence existe déjà
-        existing_pref = session.query(UserPreference).filter(
-            UserPreference.user_id == user_id,
-            UserPreference.preference_name == preference_name
-        ).first()
-        
-        if existing_pref:
-            # Mettre à jour la valeur existante
-            existing_pref.preference_value = preference_value
-        else:
-            # Créer une nouvelle préférence
-            pref = UserPreference(
-                user_id=user_id,
-                preference_name=preference_name,
-                preference_value=preference_value
-            )
-            session.add(pref)
+        # Insérer ou mettre à jour la préférence en une seule requête (INSERT ... ON CONFLICT DO UPDATE)
+        stmt = sqlite_insert(UserPreference).values(
+            user_id=user_id,
+            preference_name=preference_name,
+            preference_value=preference_value
+        ).on_conflict_do_update(
+            index_elements=["user_id", "preference_name"],
+            set_={"preference_value": preference_value}
+        )
         
+        session.execute(stmt)
         session.commit()
         
     except Exception as e:
@@ -278,6 +397,33 @@ def get_user_preference(preference_name, default_value=None, user_id="default"):
     finally:
         session.close()
 
+def get_user_preferences(preference_names, user_id="default"):
+    """
+    Récupère plusieurs préférences utilisateur en une seule requête
+    
+    Args:
+        preference_names (list): Noms des préférences
+        user_id (str): Identifiant de l'utilisateur
+        
+    Returns:
+        dict: Dictionnaire {nom de la préférence: valeur} (préférences absentes omises)
+    """
+    session = Session()
+    
+    try:
+        rows = session.query(UserPreference.preference_name, UserPreference.preference_value).filter(
+            UserPreference.user_id == user_id,
+            UserPreference.preference_name.in_(preference_names)
+        ).all()
+        return dict(rows)
+        
+    except Exception as e:
+        print(f"Erreur lors de la récupération des préférences {preference_names}: {e}")
+        return {}
+    
+    finally:
+        session.close()
+
 def get_recent_signals(limit=10):
     """
     Récupère les signaux récents de la base de données
@@ -286,12 +432,16 @@ def get_recent_signals(limit=10):
         limit (int): Nombre maximum de signaux à récupérer
         
     Returns:
-        list: Liste des signaux récents
+        list: Liste des signaux récents (tuples id, symbol, timestamp, signal_type, reason, price_at_signal, indicators_data)
     """
     session = Session()
     
     try:
-        signals = session.query(Signal).order_by(Signal.timestamp.desc()).limit(limit).all()
+        # Ne charger que les colonnes affichées, sans construire d'objets ORM
+        signals = session.query(
+            Signal.id, Signal.symbol, Signal.timestamp, Signal.signal_type,
+            Signal.reason, Signal.price_at_signal, Signal.indicators_data
+        ).order_by(Signal.timestamp.desc()).limit(limit).all()
         return signals
         
     except Exception as e:
@@ -301,7 +451,7 @@ def get_recent_signals(limit=10):
     finally:
         session.close()
 
-def get_price_history(symbol, start_date=None, end_date=None):
+def get_price_history(symbol, start_date=None, end_date=None, as_dataframe=False):
     """
     Récupère l'historique des prix d'une cryptomonnaie de la base de données
     
@@ -309,10 +459,33 @@ def get_price_history(symbol, start_date=None, end_date=None):
         symbol (str): Symbole de la cryptomonnaie
         start_date (datetime): Date de début
         end_date (datetime): Date de fin
+        as_dataframe (bool): Retourner un DataFrame OHLCV indexé par date au lieu d'objets ORM
         
     Returns:
-        list: Liste des données de prix
+        list ou pandas.DataFrame: Liste des données de prix, ou DataFrame si as_dataframe est True
     """
+    if as_dataframe:
+        try:
+            # Lecture directe des colonnes dans un DataFrame, sans instancier d'objet ORM par ligne
+            query = select(
+                PriceHistory.timestamp, PriceHistory.open, PriceHistory.high,
+                PriceHistory.low, PriceHistory.close, PriceHistory.volume
+            ).where(PriceHistory.symbol == symbol)
+            
+            if start_date:
+                query = query.where(PriceHistory.timestamp >= start_date)
+            
+            if end_date:
+                query = query.where(PriceHistory.timestamp <= end_date)
+            
+            query = query.order_by(PriceHistory.timestamp)
+            
+            return pd.read_sql(query, engine, index_col="timestamp", parse_dates=["timestamp"])
+            
+        except Exception as e:
+            print(f"Erreur lors de la récupération de l'historique des prix pour {symbol}: {e}")
+            return pd.DataFrame()
+    
     session = Session()
     
     try:
@@ -335,5 +508,49 @@ def get_price_history(symbol, start_date=None, end_date=None):
     finally:
         session.close()
 
-# Initialiser la base de données au démarrage
-init_db()
\ No newline at end of file
+def get_technical_indicators(symbol, start_date=None, end_date=None):
+    """
+    Récupère les indicateurs techniques d'une cryptomonnaie en une seule requête
+    
+    Args:
+        symbol (str): Symbole de la cryptomonnaie
+        start_date (datetime): Date de début
+        end_date (datetime): Date de fin
+        
+    Returns:
+        pandas.DataFrame: Une ligne par date et une colonne par indicateur
+    """
+    try:
+        # Parcours de l'index composite (symbol, timestamp) puis pivot en format large
+        query = select(
+            TechnicalIndicator.timestamp, TechnicalIndicator.indicator_name, TechnicalIndicator.value
+        ).where(TechnicalIndicator.symbol == symbol)
+        
+        if start_date:
+            query = query.where(TechnicalIndicator.timestamp >= start_date)
+        
+        if end_date:
+            query = query.where(TechnicalIndicator.timestamp <= end_date)
+        
+        query = query.order_by(TechnicalIndicator.timestamp, TechnicalIndicator.id)
+        
+        long_df = pd.read_sql(query, engine, parse_dates=["timestamp"])
+        
+        if long_df.empty:
+            return pd.DataFrame()
+        
+        # En cas de sauvegardes répétées d'une même date, garder la plus récente
+        wide_df = long_df.pivot_table(
+            index="timestamp", columns="indicator_name", values="value", aggfunc="last"
+        )
+        wide_df.columns.name = None
+        
+        return wide_df
+        
+    except Exception as e:
+        print(f"Erreur lors de la récupération des indicateurs pour {symbol}: {e}")
+        return pd.DataFrame()
+
+# Initialiser la base de données au démarrage (INIT_DB=0 pour l'éviter, ex: scripts et tests)
+if os.environ.get("INIT_DB", "1") == "1":
+    init_db()
\ No newline at end of file
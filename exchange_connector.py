@@ -1,7 +1,14 @@
 import ccxt
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 import json
-from database import Session, save_user_preference, get_user_preference
+from database import Session, save_user_preference, get_user_preferences
 import google_auth_oauthlib.flow
 
 # Liste des échanges supportés
@@ -9,6 +16,29 @@ SUPPORTED_EXCHANGES = [
     "binance", "coinbasepro", "kraken", "kucoin", "ftx", "bitfinex", "huobi", "alpaca"
 ]
 
+# Cache des marchés par échange: {(id, url de l'API): (horodatage, marchés, devises)}
+MARKETS_CACHE_TTL = 300
+_MARKETS_CACHE = {}
+_MARKETS_LOCK = threading.Lock()
+
+# Nouvelles tentatives après un refus pour limite de débit et disjoncteur par (échange, méthode)
+MAX_RETRIES = 4
+MAX_RETRY_DELAY = 32
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_OPEN_SECONDS = 30
+_CIRCUIT_STATE = {}
+_CIRCUIT_LOCK = threading.Lock()
+
+# Cache des informations de marché: {(id, symboles): (horodatage, tickers)}
+TICKERS_CACHE_TTL = 3.0
+_TICKERS_CACHE = {}
+_TICKERS_LOCK = threading.Lock()
+
+# Cache des identifiants lus en base: {(id de l'échange, utilisateur): (horodatage, (clé, secret))}
+CREDENTIALS_CACHE_TTL = 30
+_CREDENTIALS_CACHE = {}
+_CREDENTIALS_LOCK = threading.Lock()
+
 def get_available_exchanges():
     """
     Retourne la liste des échanges disponibles
@@ -18,6 +48,113 @@ def get_available_exchanges():
     """
     return SUPPORTED_EXCHANGES
 
+def ensure_markets(exchange, ttl=MARKETS_CACHE_TTL):
+    """
+    Charge les marchés d'un échange en réutilisant un cache partagé par le processus
+
+    Args:
+        exchange (ccxt.Exchange): Instance de l'échange
+        ttl (float): Durée de vie du cache en secondes
+
+    Returns:
+        dict: Marchés de l'échange
+    """
+    # Les marchés diffèrent entre le mode test (sandbox) et le mode réel: la clé inclut l'URL de l'API
+    key = (exchange.id, str(exchange.urls.get('api')))
+    now = time.monotonic()
+
+    with _MARKETS_LOCK:
+        cached = _MARKETS_CACHE.get(key)
+
+    if cached and now - cached[0] < ttl:
+        # Installer les marchés en cache si cette instance ne les a pas déjà
+        if getattr(exchange, '_markets_loaded_at', None) != cached[0]:
+            exchange.set_markets(cached[1], cached[2])
+            exchange._markets_loaded_at = cached[0]
+        return exchange.markets
+
+    # Cache absent ou expiré: recharger depuis l'échange
+    exchange.load_markets(True)
+    exchange._markets_loaded_at = now
+
+    with _MARKETS_LOCK:
+        _MARKETS_CACHE[key] = (now, exchange.markets, exchange.currencies)
+
+    return exchange.markets
+
+def _retry_delay(exchange, attempt):
+    """
+    Calcule l'attente avant une nouvelle tentative après un refus pour limite de débit
+
+    Args:
+        exchange (ccxt.Exchange): Instance de l'échange
+        attempt (int): Numéro de la tentative échouée (à partir de 0)
+
+    Returns:
+        float: Délai en secondes (en-tête Retry-After si fourni, sinon backoff exponentiel avec gigue)
+    """
+    headers = getattr(exchange, 'last_response_headers', None) or {}
+    try:
+        return min(float(headers.get('Retry-After')), MAX_RETRY_DELAY)
+    except (TypeError, ValueError):
+        return min(2 ** attempt, MAX_RETRY_DELAY) + random.uniform(0, 1)
+
+def _call_exchange(exchange, method, *args, retry=True, **kwargs):
+    """
+    Appelle une méthode CCXT avec nouvelles tentatives sur limite de débit et disjoncteur
+
+    Args:
+        exchange (ccxt.Exchange): Instance de l'échange
+        method (str): Nom de la méthode CCXT (ex: 'fetch_ticker')
+        *args: Arguments positionnels de la méthode
+        retry (bool): Réessayer après un refus pour limite de débit (False pour les appels non rejouables)
+        **kwargs: Arguments nommés de la méthode
+
+    Returns:
+        Résultat de la méthode CCXT
+    """
+    key = (exchange.id, method)
+
+    # Disjoncteur ouvert: rejeter immédiatement sans solliciter l'échange
+    with _CIRCUIT_LOCK:
+        failures, open_until = _CIRCUIT_STATE.get(key, (0, 0.0))
+    if time.monotonic() < open_until:
+        raise ccxt.ExchangeNotAvailable(
+            f"Appels {method} suspendus pour {exchange.id} après {failures} échecs consécutifs"
+        )
+
+    attempts = MAX_RETRIES + 1 if retry else 1
+    for attempt in range(attempts):
+        try:
+            result = getattr(exchange, method)(*args, **kwargs)
+        except ccxt.NetworkError as e:
+            # Erreurs réseau et limites de débit (DDoSProtection, RateLimitExceeded) comptent pour le disjoncteur
+            with _CIRCUIT_LOCK:
+                failures = _CIRCUIT_STATE.get(key, (0, 0.0))[0] + 1
+                open_until = time.monotonic() + CIRCUIT_OPEN_SECONDS if failures >= CIRCUIT_FAILURE_THRESHOLD else 0.0
+                _CIRCUIT_STATE[key] = (failures, open_until)
+
+            if not isinstance(e, ccxt.DDoSProtection) or attempt == attempts - 1 or open_until:
+                raise
+            time.sleep(_retry_delay(exchange, attempt))
+        else:
+            with _CIRCUIT_LOCK:
+                _CIRCUIT_STATE.pop(key, None)
+            return result
+
+def _create_http_session():
+    """
+    Crée une session HTTP avec un pool de connexions persistantes pour un échange
+
+    Returns:
+        requests.Session: Session HTTP réutilisant les connexions TCP/TLS
+    """
+    session = requests.Session()
+    # Pas de nouvelle tentative automatique: une requête d'ordre ne doit jamais être rejouée
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=0)
+    session.mount("https://", adapter)
+    return session
+
 def initialize_exchange(exchange_id, api_key=None, api_secret=None, test_mode=True, additional_params=None):
     """
     Initialise une connexion à un échange
@@ -52,6 +189,9 @@ def initialize_exchange(exchange_id, api_key=None, api_secret=None, test_mode=Tr
         exchange_class = getattr(ccxt, exchange_id.lower())
         exchange = exchange_class(params)
 
+        # Réutiliser des connexions HTTP persistantes (keep-alive) avec un pool élargi
+        exchange.session = _create_http_session()
+
         # Configurer pour le mode test si nécessaire
         if test_mode and exchange.has.get('test', False):
             exchange.set_sandbox_mode(True)
@@ -88,7 +228,7 @@ def initialize_exchange(exchange_id, api_key=None, api_secret=None, test_mode=Tr
                         pass
                 else:
                     # Pour les autres échanges
-                    exchange.load_markets()
+                    ensure_markets(exchange)
                 exchange.fetch_balance()
                 print(f"Connexion réussie à {exchange_id}" + (" (mode test)" if test_mode else ""))
             except ccxt.AuthenticationError as e:
@@ -108,6 +248,26 @@ def initialize_exchange(exchange_id, api_key=None, api_secret=None, test_mode=Tr
         print(f"Erreur lors de l'initialisation de l'échange {exchange_id}: {e}")
         return None
 
+def initialize_exchanges(configs):
+    """
+    Initialise en parallèle les connexions à plusieurs échanges
+
+    Args:
+        configs (list): Liste de dictionnaires d'arguments de initialize_exchange
+            (exchange_id, api_key, api_secret, test_mode, additional_params)
+
+    Returns:
+        dict: Dictionnaire {exchange_id: instance de l'échange ou None en cas d'erreur}
+    """
+    if not configs:
+        return {}
+
+    # Les appels réseau (chargement des marchés, test du solde) se recouvrent d'un échange à l'autre
+    with ThreadPoolExecutor(max_workers=min(8, len(configs))) as executor:
+        exchanges = list(executor.map(lambda config: initialize_exchange(**config), configs))
+
+    return {config['exchange_id']: exchange for config, exchange in zip(configs, exchanges)}
+
 def initialize_oauth_flow(client_config, scopes=None):
     """
     Initialise le flux OAuth
@@ -152,6 +312,10 @@ def save_exchange_credentials(exchange_id, api_key, api_secret, user_id="default
         save_user_preference(f"exchange_{exchange_id}_api_secret", api_secret, user_id)
         save_user_preference("selected_exchange", exchange_id, user_id)
 
+        # Les identifiants en cache ne sont plus à jour
+        with _CREDENTIALS_LOCK:
+            _CREDENTIALS_CACHE.pop((exchange_id, user_id), None)
+
         return True
     except Exception as e:
         print(f"Erreur lors de la sauvegarde des identifiants: {e}")
@@ -168,11 +332,25 @@ def get_exchange_credentials(exchange_id, user_id="default"):
     Returns:
         tuple: (api_key, api_secret) ou (None, None) si pas trouvé
     """
+    key = (exchange_id, user_id)
+    now = time.monotonic()
+
+    with _CREDENTIALS_LOCK:
+        cached = _CREDENTIALS_CACHE.get(key)
+    if cached and now - cached[0] < CREDENTIALS_CACHE_TTL:
+        return cached[1]
+
     try:
-        api_key = get_user_preference(f"exchange_{exchange_id}_api_key", None, user_id)
-        api_secret = get_user_preference(f"exchange_{exchange_id}_api_secret", None, user_id)
+        # Les deux clés en une seule requête
+        key_name = f"exchange_{exchange_id}_api_key"
+        secret_name = f"exchange_{exchange_id}_api_secret"
+        values = get_user_preferences([key_name, secret_name], user_id)
+        credentials = (values.get(key_name), values.get(secret_name))
 
-        return api_key, api_secret
+        with _CREDENTIALS_LOCK:
+            _CREDENTIALS_CACHE[key] = (now, credentials)
+
+        return credentials
     except Exception as e:
         print(f"Erreur lors de la récupération des identifiants: {e}")
         return None, None
@@ -188,23 +366,42 @@ def get_account_balance(exchange):
         dict: Soldes du compte
     """
     try:
-        balance = exchange.fetch_balance()
+        balance = _call_exchange(exchange, 'fetch_balance')
+        free = balance.get('free', {})
+        used = balance.get('used', {})
 
         # Filtrer pour ne garder que les soldes non-nuls
-        filtered_balance = {}
-        for currency, amount in balance['total'].items():
-            if amount > 0:
-                filtered_balance[currency] = {
-                    'free': balance['free'].get(currency, 0),
-                    'used': balance['used'].get(currency, 0),
-                    'total': amount
-                }
-
-        return filtered_balance
+        return {
+            currency: {
+                'free': free.get(currency, 0),
+                'used': used.get(currency, 0),
+                'total': amount
+            }
+            for currency, amount in balance['total'].items()
+            if amount > 0
+        }
     except Exception as e:
         print(f"Erreur lors de la récupération du solde: {e}")
         return {}
 
+def get_account_balances(exchanges):
+    """
+    Récupère en parallèle les soldes de plusieurs comptes
+
+    Args:
+        exchanges (list): Liste d'instances d'échanges (ccxt.Exchange)
+
+    Returns:
+        dict: Dictionnaire {id de l'échange: soldes du compte}
+    """
+    if not exchanges:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(8, len(exchanges))) as executor:
+        balances = list(executor.map(get_account_balance, exchanges))
+
+    return {exchange.id: balance for exchange, balance in zip(exchanges, balances)}
+
 def place_market_order(exchange, symbol, side, amount):
     """
     Place un ordre au marché
@@ -220,13 +417,16 @@ def place_market_order(exchange, symbol, side, amount):
     """
     try:
         # Vérifier que le marché est disponible
-        exchange.load_markets()
+        ensure_markets(exchange)
         if symbol not in exchange.markets:
-            formatted_markets = [m for m in exchange.markets.keys()]
-            raise ValueError(f"Marché {symbol} non disponible. Marchés disponibles: {formatted_markets[:10]}...")
+            formatted_markets = list(islice(exchange.markets, 10))
+            raise ValueError(f"Marché {symbol} non disponible. Marchés disponibles: {formatted_markets}...")
 
         # Placer l'ordre
-        order = exchange.create_order(
+        # Pas de nouvelle tentative: un ordre ne doit jamais être envoyé deux fois
+        order = _call_exchange(
+            exchange, 'create_order',
+            retry=False,
             symbol=symbol,
             type='market',
             side=side,
@@ -257,13 +457,16 @@ def place_limit_order(exchange, symbol, side, amount, price):
     """
     try:
         # Vérifier que le marché est disponible
-        exchange.load_markets()
+        ensure_markets(exchange)
         if symbol not in exchange.markets:
-            formatted_markets = [m for m in exchange.markets.keys()]
-            raise ValueError(f"Marché {symbol} non disponible. Marchés disponibles: {formatted_markets[:10]}...")
+            formatted_markets = list(islice(exchange.markets, 10))
+            raise ValueError(f"Marché {symbol} non disponible. Marchés disponibles: {formatted_markets}...")
 
         # Placer l'ordre
-        order = exchange.create_order(
+        # Pas de nouvelle tentative: un ordre ne doit jamais être envoyé deux fois
+        order = _call_exchange(
+            exchange, 'create_order',
+            retry=False,
             symbol=symbol,
             type='limit',
             side=side,
@@ -292,7 +495,7 @@ def get_order_status(exchange, order_id, symbol=None):
         dict: Détails de l'ordre ou None en cas d'erreur
     """
     try:
-        order = exchange.fetch_order(order_id, symbol)
+        order = _call_exchange(exchange, 'fetch_order', order_id, symbol)
         return order
     except Exception as e:
         print(f"Erreur lors de la récupération du statut de l'ordre: {e}")
@@ -311,7 +514,7 @@ def cancel_order(exchange, order_id, symbol=None):
         dict: Confirmation de l'annulation ou None en cas d'erreur
     """
     try:
-        result = exchange.cancel_order(order_id, symbol)
+        result = _call_exchange(exchange, 'cancel_order', order_id, symbol)
         return result
     except Exception as e:
         print(f"Erreur lors de l'annulation de l'ordre: {e}")
@@ -329,7 +532,7 @@ def get_open_orders(exchange, symbol=None):
         list: Liste des ordres ouverts
     """
     try:
-        orders = exchange.fetch_open_orders(symbol)
+        orders = _call_exchange(exchange, 'fetch_open_orders', symbol)
         return orders
     except Exception as e:
         print(f"Erreur lors de la récupération des ordres ouverts: {e}")
@@ -348,12 +551,57 @@ def get_order_history(exchange, symbol=None, limit=50):
         list: Liste des ordres historiques
     """
     try:
-        orders = exchange.fetch_closed_orders(symbol, limit=limit)
+        orders = _call_exchange(exchange, 'fetch_closed_orders', symbol, limit=limit)
         return orders
     except Exception as e:
         print(f"Erreur lors de la récupération de l'historique des ordres: {e}")
         return []
 
+def get_tickers(exchange, symbols, ttl=TICKERS_CACHE_TTL):
+    """
+    Récupère les informations de marché de plusieurs symboles en un minimum d'appels
+
+    Args:
+        exchange (ccxt.Exchange): Instance de l'échange
+        symbols (list): Symboles des paires (ex: ['BTC/USD', 'ETH/USD'])
+        ttl (float): Durée de vie du cache en secondes
+
+    Returns:
+        dict: Dictionnaire {symbole: informations de marché}
+    """
+    if not symbols:
+        return {}
+
+    key = (exchange.id, tuple(sorted(symbols)))
+    now = time.monotonic()
+
+    with _TICKERS_LOCK:
+        cached = _TICKERS_CACHE.get(key)
+    if cached and now - cached[0] < ttl:
+        return cached[1]
+
+    try:
+        if len(symbols) == 1:
+            tickers = {symbols[0]: _call_exchange(exchange, 'fetch_ticker', symbols[0])}
+        elif exchange.has.get('fetchTickers'):
+            # Un seul appel HTTP pour toutes les paires
+            tickers = _call_exchange(exchange, 'fetch_tickers', list(symbols))
+        else:
+            # Échange sans fetchTickers: appels individuels en parallèle
+            with ThreadPoolExecutor(max_workers=min(8, len(symbols))) as executor:
+                tickers = dict(zip(
+                    symbols,
+                    executor.map(lambda symbol: _call_exchange(exchange, 'fetch_ticker', symbol), symbols)
+                ))
+    except Exception as e:
+        print(f"Erreur lors de la récupération des informations de marché: {e}")
+        return {}
+
+    with _TICKERS_LOCK:
+        _TICKERS_CACHE[key] = (now, tickers)
+
+    return tickers
+
 def get_ticker(exchange, symbol):
     """
     Récupère les informations de marché pour un symbole
@@ -365,12 +613,7 @@ def get_ticker(exchange, symbol):
     Returns:
         dict: Informations de marché
     """
-    try:
-        ticker = exchange.fetch_ticker(symbol)
-        return ticker
-    except Exception as e:
-        print(f"Erreur lors de la récupération des informations de marché: {e}")
-        return None
+    return get_tickers(exchange, [symbol]).get(symbol)
 
 def get_available_pairs(exchange):
     """
@@ -383,13 +626,37 @@ def get_available_pairs(exchange):
         list: Liste des paires disponibles
     """
     try:
-        exchange.load_markets()
+        ensure_markets(exchange)
         return list(exchange.markets.keys())
     except Exception as e:
         print(f"Erreur lors de la récupération des paires disponibles: {e}")
         return []
 
 # Fonctions pour interagir avec la base de données
+def _order_row(exchange_id, order_details):
+    """
+    Prépare la ligne d'un ordre pour la base de données
+
+    Args:
+        exchange_id (str): ID de l'échange
+        order_details (dict): Détails de l'ordre
+
+    Returns:
+        dict: Valeurs des colonnes de la table des ordres
+    """
+    return {
+        "exchange_id": exchange_id,
+        "order_id": str(order_details['id']),
+        "symbol": order_details['symbol'],
+        "type": order_details['type'],
+        "side": order_details['side'],
+        "amount": order_details['amount'],
+        "price": order_details.get('price'),
+        "status": order_details['status'],
+        "timestamp": datetime.fromtimestamp(order_details['timestamp'] / 1000) if 'timestamp' in order_details else datetime.now(),
+        "order_details": json.dumps(order_details)
+    }
+
 def save_order_to_db(exchange_id, order_details):
     """
     Sauvegarde un ordre dans la base de données
@@ -398,31 +665,36 @@ def save_order_to_db(exchange_id, order_details):
         exchange_id (str): ID de l'échange
         order_details (dict): Détails de l'ordre
     """
+    save_orders_bulk(exchange_id, [order_details])
+
+def save_orders_bulk(exchange_id, orders):
+    """
+    Sauvegarde plusieurs ordres dans la base de données en une seule transaction
+
+    Args:
+        exchange_id (str): ID de l'échange
+        orders (list): Liste des détails des ordres
+
+    Returns:
+        bool: True si la sauvegarde a réussi, False sinon
+    """
     from database import Order
 
+    if not orders:
+        return True
+
     session = Session()
 
     try:
-        # Créer un objet Order
-        order = Order(
-            exchange_id=exchange_id,
-            order_id=str(order_details['id']),
-            symbol=order_details['symbol'],
-            type=order_details['type'],
-            side=order_details['side'],
-            amount=order_details['amount'],
-            price=order_details.get('price'),
-            status=order_details['status'],
-            timestamp=datetime.fromtimestamp(order_details['timestamp'] / 1000) if 'timestamp' in order_details else datetime.now(),
-            order_details=json.dumps(order_details)
-        )
-
-        session.add(order)
+        # Une seule requête INSERT groupée (executemany), sans objets ORM
+        session.execute(Order.__table__.insert(), [_order_row(exchange_id, order) for order in orders])
         session.commit()
+        return True
 
     except Exception as e:
         session.rollback()
-        print(f"Erreur lors de la sauvegarde de l'ordre: {e}")
+        print(f"Erreur lors de la sauvegarde des ordres: {e}")
+        return False
 
     finally:
         session.close()
@@ -442,18 +714,17 @@ def update_order_status_in_db(exchange_id, order_id, new_status, updated_details
     session = Session()
 
     try:
-        # Récupérer l'ordre
-        order = session.query(Order).filter(
+        values = {Order.status: new_status}
+        if updated_details:
+            values[Order.order_details] = json.dumps(updated_details)
+
+        # Mettre à jour l'ordre en une seule requête UPDATE, sans le charger au préalable
+        session.query(Order).filter(
             Order.exchange_id == exchange_id,
             Order.order_id == str(order_id)
-        ).first()
+        ).update(values, synchronize_session=False)
 
-        if order:
-            order.status = new_status
-            if updated_details:
-                order.order_details = json.dumps(updated_details)
-
-            session.commit()
+        session.commit()
 
     except Exception as e:
         session.rollback()
@@ -473,14 +744,18 @@ def get_orders_from_db(exchange_id=None, symbol=None, status=None, limit=50):
         limit (int): Nombre maximum d'ordres à récupérer
 
     Returns:
-        list: Liste des ordres
+        list: Liste des ordres (tuples order_id, symbol, type, side, amount, price, status, timestamp)
     """
     from database import Order
 
     session = Session()
 
     try:
-        query = session.query(Order)
+        # Ne charger que les colonnes affichées, sans construire d'objets ORM
+        query = session.query(
+            Order.order_id, Order.symbol, Order.type, Order.side,
+            Order.amount, Order.price, Order.status, Order.timestamp
+        )
 
         if exchange_id:
             query = query.filter(Order.exchange_id == exchange_id)
@@ -1,29 +1,43 @@
 import os
 import json
+from collections import deque
 from datetime import datetime
 
 class IAAgent:
+    # Mots-clés de chaque catégorie de requête, testés dans l'ordre (recherche de sous-chaînes)
+    _CATEGORIES = (
+        ("analysis", ("analyse", "prédis", "tendance")),
+        ("trading", ("acheter", "vendre", "trader")),
+    )
+    
+    # Nombre maximal de messages conservés dans l'historique (les plus anciens sont oubliés)
+    MAX_HISTORY = 1000
+    
     def __init__(self):
         self._password = "admin123"  # À changer pour un vrai mot de passe
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=self.MAX_HISTORY)
         
     def authenticate(self, password):
         return password == self._password
         
     def process_query(self, query, context=None):
         try:
+            # Un seul horodatage pour la requête et sa réponse (générée immédiatement)
+            timestamp = datetime.now().isoformat()
+            
             # Ajouter la requête à l'historique
             self.conversation_history.append({
                 "role": "user",
                 "content": query,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             })
             
-            # Analyse de base de la requête
+            # Analyse de base de la requête (catégorie calculée une seule fois)
+            query_type = self._categorize_query(query)
             response = {
-                "type": self._categorize_query(query),
-                "response": self._generate_response(query, context),
-                "timestamp": datetime.now().isoformat()
+                "type": query_type,
+                "response": self._generate_response(query, context, query_type),
+                "timestamp": timestamp
             }
             
             # Ajouter la réponse à l'historique
@@ -44,15 +58,14 @@ class IAAgent:
     
     def _categorize_query(self, query):
         query = query.lower()
-        if any(word in query for word in ["analyse", "prédis", "tendance"]):
-            return "analysis"
-        elif any(word in query for word in ["acheter", "vendre", "trader"]):
-            return "trading"
-        else:
-            return "general"
+        for category, keywords in self._CATEGORIES:
+            if any(word in query for word in keywords):
+                return category
+        return "general"
             
-    def _generate_response(self, query, context=None):
-        query_type = self._categorize_query(query)
+    def _generate_response(self, query, context=None, query_type=None):
+        if query_type is None:
+            query_type = self._categorize_query(query)
         
         if query_type == "analysis":
             return "Pour analyser les marchés, je vous conseille de regarder les indicateurs techniques comme le RSI et le MACD, ainsi que le volume des échanges."
@@ -62,4 +75,4 @@ class IAAgent:
             return "Je suis votre assistant IA pour l'analyse et le trading de cryptomonnaies. Comment puis-je vous aider ?"
             
     def get_conversation_history(self):
-        return self.conversation_history
\ No newline at end of file
+        return list(self.conversation_history)
\ No newline at end of file
@@ -1,32 +1,43 @@
 import pandas as pd
 import numpy as np
 
-def calculate_technical_indicators(df):
+def calculate_technical_indicators(df, indicators=None, inplace=False):
     """
     Calcule les indicateurs techniques pour un DataFrame de données de prix
     
     Args:
         df (pandas.DataFrame): DataFrame avec les colonnes OHLCV
+        indicators (list): Indicateurs à calculer ("RSI", "MACD", "Bollinger Bands", "EMA", "SMA"),
+            tous si None
+        inplace (bool): Ajouter les colonnes d'indicateurs directement au DataFrame fourni
         
     Returns:
         pandas.DataFrame: DataFrame original avec les indicateurs techniques ajoutés
     """
-    # Copier le DataFrame pour éviter de modifier l'original
-    df_copy = df.copy()
+    # Les calculs ne font qu'ajouter des colonnes: une copie superficielle suffit à préserver
+    # l'original sans dupliquer les données OHLCV
+    df_copy = df if inplace else df.copy(deep=False)
+    
+    # Ne calculer que les indicateurs demandés (tous par défaut)
+    selected = None if indicators is None else set(indicators)
     
     # Calculer le RSI (Relative Strength Index)
-    df_copy = calculate_rsi(df_copy)
+    if selected is None or "RSI" in selected:
+        df_copy = calculate_rsi(df_copy)
     
     # Calculer le MACD (Moving Average Convergence Divergence)
-    df_copy = calculate_macd(df_copy)
+    if selected is None or "MACD" in selected:
+        df_copy = calculate_macd(df_copy)
     
     # Calculer les bandes de Bollinger
-    df_copy = calculate_bollinger_bands(df_copy)
+    if selected is None or "Bollinger Bands" in selected:
+        df_copy = calculate_bollinger_bands(df_copy)
     
-    # Calculer les moyennes mobiles
-    df_copy = calculate_moving_averages(df_copy)
+    # Calculer les moyennes mobiles (SMA et EMA sont calculées ensemble)
+    if selected is None or "SMA" in selected or "EMA" in selected:
+        df_copy = calculate_moving_averages(df_copy)
     
-    # Calculer les signaux basés sur les indicateurs
+    # Calculer les signaux basés sur les indicateurs disponibles
     df_copy = calculate_signals(df_copy)
     
     return df_copy
@@ -42,15 +53,21 @@ def calculate_rsi(df, period=14):
     Returns:
         pandas.DataFrame: DataFrame avec le RSI ajouté
     """
-    close_delta = df['close'].diff()
-    
-    # Séparer les gains et les pertes
-    up = close_delta.clip(lower=0)
-    down = -1 * close_delta.clip(upper=0)
-    
-    # Calculer la moyenne mobile exponentielle des gains et des pertes
-    ma_up = up.ewm(com=period-1, adjust=True, min_periods=period).mean()
-    ma_down = down.ewm(com=period-1, adjust=True, min_periods=period).mean()
+    # Travailler sur le tableau numpy sous-jacent pour éviter les Series intermédiaires
+    close = df['close'].to_numpy(dtype=float)
+    close_delta = np.empty_like(close)
+    close_delta[:1] = np.nan
+    np.subtract(close[1:], close[:-1], out=close_delta[1:])
+    
+    # Séparer les gains et les pertes en une passe chacun, sans masque intermédiaire
+    # (np.maximum propage le NaN: la première valeur reste indéfinie)
+    up = np.maximum(close_delta, 0.0)
+    down = np.negative(close_delta)
+    np.maximum(down, 0.0, out=down)
+    
+    # Calculer la moyenne mobile exponentielle des gains et des pertes (noyau compilé de pandas)
+    ma_up = pd.Series(up).ewm(com=period-1, adjust=True, min_periods=period).mean().to_numpy()
+    ma_down = pd.Series(down).ewm(com=period-1, adjust=True, min_periods=period).mean().to_numpy()
     
     # Calculer le RSI
     rsi = 100 - (100 / (1 + ma_up / ma_down))
@@ -73,13 +90,16 @@ def calculate_macd(df, fast_period=12, slow_period=26, signal_period=9):
     Returns:
         pandas.DataFrame: DataFrame avec le MACD ajouté
     """
-    # Calculer les moyennes mobiles exponentielles
-    ema_fast = df['close'].ewm(span=fast_period, adjust=False).mean()
-    ema_slow = df['close'].ewm(span=slow_period, adjust=False).mean()
+    # Série sans index pour éviter l'alignement des index dans les opérations intermédiaires
+    close = pd.Series(df['close'].to_numpy(dtype=float))
+    
+    # Calculer les moyennes mobiles exponentielles (noyau compilé de pandas)
+    ema_fast = close.ewm(span=fast_period, adjust=False).mean().to_numpy()
+    ema_slow = close.ewm(span=slow_period, adjust=False).mean().to_numpy()
     
     # Calculer le MACD et la ligne de signal
     macd = ema_fast - ema_slow
-    macd_signal = macd.ewm(span=signal_period, adjust=False).mean()
+    macd_signal = pd.Series(macd).ewm(span=signal_period, adjust=False).mean().to_numpy()
     macd_hist = macd - macd_signal
     
     # Ajouter les indicateurs au DataFrame
@@ -101,15 +121,19 @@ def calculate_bollinger_bands(df, period=20, num_std=2):
     Returns:
         pandas.DataFrame: DataFrame avec les bandes de Bollinger ajoutées
     """
+    # Une seule fenêtre glissante pour la moyenne et l'écart type (noyaux compilés de pandas, en O(n))
+    rolling_close = df['close'].rolling(window=period)
+    
     # Calculer la moyenne mobile
-    df['BB_middle'] = df['close'].rolling(window=period).mean()
+    bb_middle = rolling_close.mean().to_numpy()
     
     # Calculer l'écart type
-    rolling_std = df['close'].rolling(window=period).std()
+    band_width = rolling_close.std().to_numpy() * num_std
     
     # Calculer les bandes supérieure et inférieure
-    df['BB_upper'] = df['BB_middle'] + (rolling_std * num_std)
-    df['BB_lower'] = df['BB_middle'] - (rolling_std * num_std)
+    df['BB_middle'] = bb_middle
+    df['BB_upper'] = bb_middle + band_width
+    df['BB_lower'] = bb_middle - band_width
     
     return df
 
@@ -123,13 +147,24 @@ def calculate_moving_averages(df):
     Returns:
         pandas.DataFrame: DataFrame avec les moyennes mobiles ajoutées
     """
-    # Calculer la moyenne mobile simple (SMA)
-    df['SMA_50'] = df['close'].rolling(window=50).mean()
-    df['SMA_200'] = df['close'].rolling(window=200).mean()
-    
-    # Calculer la moyenne mobile exponentielle (EMA)
-    df['EMA_20'] = df['close'].ewm(span=20, adjust=False).mean()
-    df['EMA_50'] = df['close'].ewm(span=50, adjust=False).mean()
+    close = df['close'].to_numpy(dtype=float)
+    
+    # Calculer la moyenne mobile simple (SMA): une seule somme cumulée sert aux deux fenêtres
+    # (une valeur manquante contaminerait la somme cumulée: fenêtres glissantes de pandas dans ce cas)
+    has_gaps = np.isnan(close).any()
+    cumulative = None if has_gaps else np.concatenate(([0.0], np.cumsum(close)))
+    for window, column in ((50, 'SMA_50'), (200, 'SMA_200')):
+        if has_gaps:
+            df[column] = df['close'].rolling(window=window).mean()
+            continue
+        sma = np.full(len(close), np.nan)
+        sma[window - 1:] = (cumulative[window:] - cumulative[:-window]) / window
+        df[column] = sma
+    
+    # Calculer la moyenne mobile exponentielle (EMA) sur une série sans index
+    close_series = pd.Series(close)
+    df['EMA_20'] = close_series.ewm(span=20, adjust=False).mean().to_numpy()
+    df['EMA_50'] = close_series.ewm(span=50, adjust=False).mean().to_numpy()
     
     return df
 
@@ -143,44 +178,75 @@ def calculate_signals(df):
     Returns:
         pandas.DataFrame: DataFrame avec les signaux ajoutés
     """
-    # Initialiser la colonne de signal à 0 (neutre)
-    df['signal'] = 0
+    # Colonnes disponibles, lues une seule fois
+    columns = frozenset(df.columns)
+    
+    # Conditions (masques numpy) dans l'ordre de priorité croissante: la dernière vraie l'emporte
+    conditions = []
+    values = []
     
     # Signaux basés sur le RSI
-    if 'RSI' in df.columns:
+    if 'RSI' in columns:
+        rsi = df['RSI'].to_numpy()
         # Signal d'achat si RSI < 30
-        df.loc[df['RSI'] < 30, 'signal'] = 1
+        conditions.append(rsi < 30)
+        values.append(1)
         # Signal de vente si RSI > 70
-        df.loc[df['RSI'] > 70, 'signal'] = -1
+        conditions.append(rsi > 70)
+        values.append(-1)
     
     # Signaux basés sur le MACD
-    if all(col in df.columns for col in ['MACD', 'MACD_signal']):
-        # Calculer les croisements du MACD
-        df['macd_crossover'] = 0
+    if {'MACD', 'MACD_signal'} <= columns:
+        macd = df['MACD'].to_numpy()
+        macd_signal = df['MACD_signal'].to_numpy()
         # Croisement haussier: MACD croise au-dessus de la ligne de signal
-        df.loc[(df['MACD'] > df['MACD_signal']) & (df['MACD'].shift(1) <= df['MACD_signal'].shift(1)), 'macd_crossover'] = 1
+        conditions.append(_crossover(macd, macd_signal))
+        values.append(1)
         # Croisement baissier: MACD croise en-dessous de la ligne de signal
-        df.loc[(df['MACD'] < df['MACD_signal']) & (df['MACD'].shift(1) >= df['MACD_signal'].shift(1)), 'macd_crossover'] = -1
-        
-        # Ajouter les signaux du MACD au signal principal
-        df.loc[df['macd_crossover'] == 1, 'signal'] = 1
-        df.loc[df['macd_crossover'] == -1, 'signal'] = -1
+        conditions.append(_crossover(macd_signal, macd))
+        values.append(-1)
     
     # Signaux basés sur les bandes de Bollinger
-    if all(col in df.columns for col in ['BB_upper', 'BB_lower']):
+    if {'BB_upper', 'BB_lower'} <= columns:
+        close = df['close'].to_numpy()
         # Signal d'achat potentiel si le prix est proche de la bande inférieure
-        df.loc[df['close'] < df['BB_lower'] * 1.01, 'signal'] = 1
+        conditions.append(close < df['BB_lower'].to_numpy() * 1.01)
+        values.append(1)
         # Signal de vente potentiel si le prix est proche de la bande supérieure
-        df.loc[df['close'] > df['BB_upper'] * 0.99, 'signal'] = -1
+        conditions.append(close > df['BB_upper'].to_numpy() * 0.99)
+        values.append(-1)
     
     # Signaux basés sur les moyennes mobiles
-    if all(col in df.columns for col in ['SMA_50', 'SMA_200']):
+    if {'SMA_50', 'SMA_200'} <= columns:
+        sma_50 = df['SMA_50'].to_numpy()
+        sma_200 = df['SMA_200'].to_numpy()
         # Golden Cross (signal d'achat): SMA 50 croise au-dessus de SMA 200
-        golden_cross = (df['SMA_50'] > df['SMA_200']) & (df['SMA_50'].shift(1) <= df['SMA_200'].shift(1))
-        df.loc[golden_cross, 'signal'] = 1
-        
+        conditions.append(_crossover(sma_50, sma_200))
+        values.append(1)
         # Death Cross (signal de vente): SMA 50 croise en-dessous de SMA 200
-        death_cross = (df['SMA_50'] < df['SMA_200']) & (df['SMA_50'].shift(1) >= df['SMA_200'].shift(1))
-        df.loc[death_cross, 'signal'] = -1
+        conditions.append(_crossover(sma_200, sma_50))
+        values.append(-1)
+    
+    # np.select retient la première condition vraie: parcourir de la plus prioritaire à la moins prioritaire
+    # (0 = neutre par défaut), puis une seule écriture dans le DataFrame
+    if conditions:
+        df['signal'] = np.select(conditions[::-1], values[::-1], default=0).astype(np.int8)
+    else:
+        df['signal'] = np.zeros(len(df), dtype=np.int8)
     
     return df
+
+def _crossover(fast, slow):
+    """
+    Détecte les points où une série croise au-dessus d'une autre
+    
+    Args:
+        fast (numpy.ndarray): Série qui croise
+        slow (numpy.ndarray): Série de référence
+        
+    Returns:
+        numpy.ndarray: Masque booléen, vrai quand fast passe au-dessus de slow (jamais sur le premier point)
+    """
+    crossed = np.zeros(len(fast), dtype=bool)
+    crossed[1:] = (fast[1:] > slow[1:]) & (fast[:-1] <= slow[:-1])
+    return crossed
@@ -1,14 +1,9 @@
-import locale
+from functools import lru_cache
+import numpy as np
 from datetime import datetime
 
-# Configurer le format de devise
-try:
-    locale.setlocale(locale.LC_ALL, 'fr_FR.UTF-8')
-except:
-    try:
-        locale.setlocale(locale.LC_ALL, 'fr_FR')
-    except:
-        pass  # Utilisation des paramètres par défaut si la locale française n'est pas disponible
+# Note: la locale du processus n'est pas modifiée (setlocale est global à tous les threads);
+# les formats ci-dessous sont explicites et n'en dépendent pas
 
 def format_currency(value):
     """
@@ -23,6 +18,22 @@ def format_currency(value):
     if value is None:
         return "N/A"
     
+    try:
+        return _format_currency_cached(value)
+    except TypeError:
+        # Valeur non hachable: pas de mise en cache
+        return _format_currency_uncached(value)
+
+def _format_currency_uncached(value):
+    """
+    Formate un nombre en devise (USD) selon son ordre de grandeur
+    
+    Args:
+        value (float): Valeur à formater
+        
+    Returns:
+        str: Valeur formatée en devise
+    """
     try:
         if value >= 1000:
             return f"${value:,.2f}"
@@ -35,6 +46,34 @@ def format_currency(value):
     except:
         return str(value)
 
+# Les mêmes prix et soldes reviennent à chaque réexécution: mémoriser leur formatage
+# (clé = valeur exacte; l'arrondir changerait le résultat aux frontières de précision)
+_format_currency_cached = lru_cache(maxsize=4096)(_format_currency_uncached)
+
+def format_currency_array(values):
+    """
+    Formate un tableau de nombres en devise (USD), avec les mêmes paliers de précision que format_currency
+    
+    Args:
+        values (array-like): Valeurs numériques à formater
+        
+    Returns:
+        numpy.ndarray: Tableau de chaînes formatées en devise
+    """
+    values = np.asarray(values, dtype=float)
+    
+    # Formater chaque palier de précision en une seule opération
+    formatted = np.where(
+        values >= 1, np.char.mod("$%.2f", values),
+        np.where(values >= 0.01, np.char.mod("$%.4f", values), np.char.mod("$%.8f", values))
+    ).astype(object)
+    
+    # Séparateur de milliers pour les grandes valeurs (non pris en charge par np.char.mod)
+    large = values >= 1000
+    formatted[large] = [f"${value:,.2f}" for value in values[large].tolist()]
+    
+    return formatted
+
 def format_date(timestamp, format_str="%d/%m/%Y %H:%M"):
     """
     Formate un timestamp en date lisible